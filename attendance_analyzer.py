@@ -4,27 +4,60 @@
 用於分析考勤記錄並計算遲到/加班時數
 """
 
+import calendar
+import functools
 import json
 import logging
 import os
 import sys
 from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, fields, replace
+from datetime import date, datetime
 from enum import Enum
 from urllib.parse import urlparse
 
-from lib.state import AttendanceStateManager
+from lib import csv_exporter, parser as attendance_parser
+from lib.backup import backup_with_timestamp
+from lib.config import AttendanceConfig
+from lib.dates import identify_complete_work_days, years_from_records
+from lib.filename import parse_range_and_user
+from lib.holidays import HolidayService, TaiwanGovOpenDataProvider
+from lib.policy import (
+    Rules,
+    calculate_early_leave,
+    calculate_expected_checkout,
+    calculate_late_minutes,
+    calculate_leave_suggestion,
+    calculate_overtime_minutes,
+    is_full_day_absent,
+)
+from lib.records_pass import analyze_records, complete_days_from_daily
+from lib.report import build_incremental_lines, build_issue_section, build_summary
+from lib.state import AttendanceStateManager, filter_unprocessed_dates
+
+# 注意：lib.excel_exporter 反向 import 本模組的 Issue/IssueType，
+# 必須維持呼叫時才載入，避免循環導入。
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _read_config_file(path: str, mtime: float) -> dict:
+    """讀取並解析設定檔；以 (路徑, mtime) 為 key 快取，避免每個分析器重讀。"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 真值字面值集合：模組常數，免得每次呼叫都重建 set
+_TRUTHY_VALUES = frozenset({"1", "true", "yes", "on"})
+
+
 def _env_flag(name: str, default: bool = False) -> bool:
     value = os.getenv(name)
     if value is None:
         return default
-    return value.strip().lower() in {"1", "true", "yes", "on"}
+    return value.strip().lower() in _TRUTHY_VALUES
 
 
 class AttendanceType(Enum):
@@ -41,7 +74,7 @@ class IssueType(Enum):
     WEEKDAY_LEAVE = "請假"
 
 
-@dataclass
+@dataclass(slots=True)
 class AttendanceRecord:
     date: datetime
     scheduled_time: datetime | None
@@ -55,7 +88,7 @@ class AttendanceRecord:
     note: str
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkDay:
     date: datetime
     checkin_record: AttendanceRecord | None
@@ -64,7 +97,7 @@ class WorkDay:
     is_holiday: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
     date: datetime
     type: IssueType
@@ -73,6 +106,12 @@ class Issue:
     time_range: str = ""
     calculation: str = ""
     is_new: bool = True  # 標示是否為本次新發現的問題
+    # 預先格式化的日期字串：報表/CSV/Excel 各匯出路徑共用，免去重複 strftime
+    date_str: str = ""
+
+    def __post_init__(self):
+        if not self.date_str and self.date:
+            self.date_str = self.date.strftime("%Y/%m/%d")
 
     # AttendanceStateManager 已抽離至 lib.state
 
@@ -89,8 +128,6 @@ class AttendanceAnalyzer:
         unprocessed_only: bool = False,
     ):
         # 初始化配置
-        from lib.config import AttendanceConfig
-
         self.config = AttendanceConfig()
         self._load_config(config_path)
         self.records: list[AttendanceRecord] = []
@@ -106,6 +143,13 @@ class AttendanceAnalyzer:
         # 來源檔名（供狀態管理使用；API 模式時不依賴 sys.argv）
         self.source_file_name: str | None = None
         self.unprocessed_only: bool = unprocessed_only  # 是否只分析未處理的記錄
+        # 快取：同一次執行中 analyze/report/export 會重複呼叫完整工作日計算，
+        # records 在單次執行內僅追加，以筆數為 key 即可
+        self._complete_days_cache: tuple[int, list[datetime]] | None = None
+        self._unprocessed_dates_cache: tuple[tuple[str, int], list[datetime]] | None = None
+        # 解析時順手融合的年份/每日分組（見 parse_attendance_file），
+        # 以筆數為 key；records 被外部改動（如 unprocessed_only 過濾）即失效
+        self._grouping_cache: tuple[int, set[int], dict] | None = None
         if debug is None:
             debug = _env_flag("FHR_DEBUG", False)
         self.debug_mode = debug
@@ -119,20 +163,27 @@ class AttendanceAnalyzer:
             logger.info("找不到設定檔 %s，使用預設值", config_path)
             return
         try:
-            with open(config_path, encoding="utf-8") as f:
-                data = json.load(f)
-            for key, value in data.items():
-                if hasattr(self.config, key):
-                    setattr(self.config, key, value)
+            data = _read_config_file(config_path, os.path.getmtime(config_path))
+            # AttendanceConfig 為 frozen dataclass：一次 replace 產生覆寫後的新實例。
+            # 只接受真正的 dataclass 欄位——hasattr 會連衍生 property 也放行，
+            # replace() 收到那些鍵會丟 TypeError；未知鍵一律靜默忽略
+            valid_fields = {f.name for f in fields(self.config)}
+            overrides = {key: value for key, value in data.items() if key in valid_fields}
+            if overrides:
+                self.config = replace(self.config, **overrides)
+                for key, value in overrides.items():
                     logger.debug("⚙️  覆寫設定 %s=%s", key, value)
         except (OSError, json.JSONDecodeError) as e:
             logger.warning("無法讀取設定檔 %s: %s", config_path, e)
 
     def _identify_complete_work_days(self) -> list[datetime]:
-        """識別完整的工作日（委派至 lib.dates）"""
-        from lib.dates import identify_complete_work_days
-
-        return identify_complete_work_days(self.records)
+        """識別完整的工作日（委派至 lib.dates，結果依記錄筆數快取）"""
+        key = len(self.records)
+        if self._complete_days_cache and self._complete_days_cache[0] == key:
+            return self._complete_days_cache[1]
+        complete_days = identify_complete_work_days(self.records)
+        self._complete_days_cache = (key, complete_days)
+        return complete_days
 
     def _get_unprocessed_dates(
         self, user_name: str, complete_days: list[datetime]
@@ -140,10 +191,26 @@ class AttendanceAnalyzer:
         """取得需要處理的新日期（委派至 lib.state.filter_unprocessed_dates）"""
         if not self.state_manager or not self.incremental_mode:
             return complete_days
-        from lib.state import filter_unprocessed_dates
-
+        key = (user_name, len(complete_days))
+        if self._unprocessed_dates_cache and self._unprocessed_dates_cache[0] == key:
+            return self._unprocessed_dates_cache[1]
         processed_ranges = self.state_manager.get_user_processed_ranges(user_name)
-        return filter_unprocessed_dates(processed_ranges, complete_days)
+        unprocessed = filter_unprocessed_dates(processed_ranges, complete_days)
+        self._unprocessed_dates_cache = (key, unprocessed)
+        return unprocessed
+
+    def has_unprocessed_work(self) -> bool:
+        """檢查是否有新的完整工作日待分析（增量模式的快速判斷）
+
+        非增量模式一律回傳 True；增量模式下僅在「已有完整工作日且全數
+        處理過」時回傳 False，讓 CLI 能在重複執行時直接略過分析與匯出。
+        """
+        if not (self.incremental_mode and self.current_user):
+            return True
+        complete_days = self._identify_complete_work_days()
+        if not complete_days:
+            return True
+        return bool(self._get_unprocessed_dates(self.current_user, complete_days))
 
     def _load_previous_forget_punch_usage(self, user_name: str) -> None:
         """載入之前的忘刷卡使用統計"""
@@ -162,8 +229,6 @@ class AttendanceAnalyzer:
 
     def _get_years_from_records(self) -> set:
         """從出勤記錄中提取年份（委派至 lib.dates）"""
-        from lib.dates import years_from_records
-
         return years_from_records(self.records)
 
     def _load_taiwan_holidays(self, years: set = None) -> None:
@@ -176,8 +241,6 @@ class AttendanceAnalyzer:
 
         for year in years:
             if year not in self.loaded_holiday_years:
-                from lib.holidays import HolidayService
-
                 logger.info("資訊: 動態載入 %d 年國定假日...", year)
                 service = HolidayService()
                 self.holidays |= service.load_year(year)
@@ -185,8 +248,6 @@ class AttendanceAnalyzer:
 
     def _try_load_from_gov_api(self, year: int) -> bool:
         # 向後相容：保留本模組內的 scheme 檢查（供單元測試 patch）
-        from lib.holidays import TaiwanGovOpenDataProvider
-
         url = TaiwanGovOpenDataProvider.JSDELIVR_URL_TEMPLATE.format(year=year)
         parsed = urlparse(url)
         if parsed.scheme not in {"http", "https"}:
@@ -206,6 +267,10 @@ class AttendanceAnalyzer:
             incremental: 是否啟用增量分析
         """
         self.incremental_mode = incremental
+        # 重新解析即失效快取
+        self._complete_days_cache = None
+        self._unprocessed_dates_cache = None
+        self._grouping_cache = None
         # 保存來源檔名供狀態管理記錄
         try:
             self.source_file_name = os.path.basename(filepath)
@@ -217,8 +282,6 @@ class AttendanceAnalyzer:
             self.state_manager = AttendanceStateManager(read_only=self.debug_mode)
 
             # 解析檔名取得使用者資訊
-            from lib.filename import parse_range_and_user
-
             user_name, start_date, end_date = parse_range_and_user(filepath)
             if user_name:
                 self.current_user = user_name
@@ -241,11 +304,19 @@ class AttendanceAnalyzer:
                 self.incremental_mode = False
 
         # 解析檔案內容
+        # 一次讀入整檔再 splitlines：單次 decode、一次切行，比 readlines
+        # 逐行建立帶換行符的字串便宜，strip 也少處理一個字元
         with open(filepath, encoding="utf-8") as f:
-            lines = f.readlines()
+            lines = f.read().splitlines()
         logger.debug("📥  讀入檔案 %s，共 %d 行資料", filepath, len(lines))
 
         parsed_records = 0
+        # 解析迴圈同時累加年份與每日分組（與 lib.records_pass 同構），
+        # 讓 group_records_by_day 免去對 records 的第二次完整走訪
+        started_empty = not self.records
+        years_in_data: set[int] = set()
+        daily_records: dict = {}
+        checkin = AttendanceType.CHECKIN
         for line_num, line in enumerate(lines, 1):
             line = line.strip()
             if not line:
@@ -256,8 +327,17 @@ class AttendanceAnalyzer:
                 if record:
                     self.records.append(record)
                     parsed_records += 1
+                    day = record.date
+                    if day:
+                        years_in_data.add(day.year)
+                        slot = daily_records.get(day)
+                        if slot is None:
+                            slot = daily_records[day] = [None, None]
+                        slot[0 if record.type is checkin else 1] = record
             except (ValueError, IndexError) as e:
                 logger.warning("第%d行解析失敗: %s", line_num, e)
+        if started_empty:
+            self._grouping_cache = (len(self.records), years_in_data, daily_records)
         skipped_lines = max(len(lines) - parsed_records, 0)
         logger.debug(
             "✅  完成解析，有效紀錄 %d 筆，略過 %d 行",
@@ -279,9 +359,7 @@ class AttendanceAnalyzer:
 
     def _parse_attendance_line(self, line: str) -> AttendanceRecord | None:
         """解析單行考勤記錄（委派至 lib.parser）"""
-        from lib import parser as p
-
-        parsed = p.parse_line(line)
+        parsed = attendance_parser.parse_line(line)
         if not parsed:
             return None
         (
@@ -311,22 +389,27 @@ class AttendanceAnalyzer:
 
     def group_records_by_day(self) -> None:
         """將記錄按日期分組"""
+        # 優先取用解析時融合累加的分組（kernel fusion：同資料不重走訪）；
+        # records 事後被改動（筆數不符）則退回單次走訪路徑
+        cache = self._grouping_cache
+        if cache and cache[0] == len(self.records):
+            _, years_in_data, daily_records = cache
+            complete_days = complete_days_from_daily(daily_records)
+        else:
+            years_in_data, complete_days, daily_records = analyze_records(self.records)
+        self._complete_days_cache = (len(self.records), complete_days)
+
         # 在分組前，先載入出勤資料中涉及的年份假日
-        years_in_data = self._get_years_from_records()
         if years_in_data:
             self._load_taiwan_holidays(years_in_data)
 
-        from lib.grouping import group_daily
-
-        daily_records = group_daily(self.records)
-
-        for date, records in daily_records.items():
+        for day, records in daily_records.items():
             workday = WorkDay(
-                date=datetime.combine(date, datetime.min.time()),
-                checkin_record=records["checkin"],
-                checkout_record=records["checkout"],
-                is_friday=(date.weekday() == 4),  # 週五是4
-                is_holiday=(date in self.holidays),  # 檢查是否為國定假日
+                date=datetime.combine(day, datetime.min.time()),
+                checkin_record=records[0],
+                checkout_record=records[1],
+                is_friday=(day.weekday() == 4),  # 週五是4
+                is_holiday=(day in self.holidays),  # 檢查是否為國定假日
             )
             self.workdays.append(workday)
 
@@ -343,8 +426,6 @@ class AttendanceAnalyzer:
 
         workdays_to_analyze = self._get_workdays_to_analyze()
 
-        from lib.policy import Rules
-
         rules = Rules(
             schedule_start=self.config.schedule_start,
             schedule_end=self.config.schedule_end,
@@ -420,8 +501,6 @@ class AttendanceAnalyzer:
 
     def _add_monthly_wfh_issues(self) -> None:
         """補上涵蓋月份中所有週五的 WFH 建議，方便提前一次請完"""
-        import calendar
-
         existing_wfh_dates = {
             issue.date.date() for issue in self.issues if issue.type == IssueType.WFH
         }
@@ -434,8 +513,6 @@ class AttendanceAnalyzer:
                 date_num, weekday = day
                 if date_num == 0 or weekday != 4:  # 只看週五
                     continue
-                from datetime import date
-
                 friday = date(year, month, date_num)
                 if friday in existing_wfh_dates:
                     continue
@@ -457,8 +534,6 @@ class AttendanceAnalyzer:
             self.issues.sort(key=lambda x: x.date)
 
     def _handle_absent_day(self, workday: WorkDay) -> bool:
-        from lib.policy import is_full_day_absent
-
         if is_full_day_absent(workday):
             if workday.is_friday and not workday.is_holiday:
                 self.issues.append(
@@ -482,14 +557,6 @@ class AttendanceAnalyzer:
         return False
 
     def _analyze_single_workday(self, workday: WorkDay, rules) -> None:
-        from lib.policy import (
-            calculate_early_leave,
-            calculate_expected_checkout,
-            calculate_late_minutes,
-            calculate_leave_suggestion,
-            calculate_overtime_minutes,
-        )
-
         if self._handle_absent_day(workday):
             return
 
@@ -605,6 +672,8 @@ class AttendanceAnalyzer:
 
         # 儲存狀態檔案
         self.state_manager.save_state()
+        # 狀態已前進，未處理日期快取失效（後續報表/匯出需反映最新狀態）
+        self._unprocessed_dates_cache = None
         logger.info("💾 已更新處理狀態: %s 至 %s", start_date, end_date)
 
     def generate_report(self) -> str:
@@ -616,8 +685,6 @@ class AttendanceAnalyzer:
         if self.incremental_mode and self.current_user:
             complete_days = self._identify_complete_work_days()
             unprocessed_dates = self._get_unprocessed_dates(self.current_user, complete_days)
-            from lib.report import build_incremental_lines
-
             report.extend(
                 build_incremental_lines(
                     self.current_user,
@@ -631,8 +698,6 @@ class AttendanceAnalyzer:
         forget_punch_issues = [
             issue for issue in self.issues if issue.type == IssueType.FORGET_PUNCH
         ]
-        from lib.report import build_issue_section, build_summary
-
         report.extend(
             build_issue_section("## 🔄 建議使用忘刷卡的日期：", "🔄", forget_punch_issues)
         )
@@ -660,8 +725,7 @@ class AttendanceAnalyzer:
                     issue.date.weekday()
                 ]
                 report.append(
-                    f"{i}. **{issue.date.strftime('%Y/%m/%d')} ({weekday_name})** - "
-                    f"📝 {issue.description}"
+                    f"{i}. **{issue.date_str} ({weekday_name})** - 📝 {issue.description}"
                 )
             report.append("")
 
@@ -670,9 +734,7 @@ class AttendanceAnalyzer:
         if wfh_issues:
             report.append("## 🏠 建議申請WFH假的日期：\n")
             for i, issue in enumerate(wfh_issues, 1):
-                report.append(
-                    f"{i}. **{issue.date.strftime('%Y/%m/%d')}** - 😊 {issue.description}"
-                )
+                report.append(f"{i}. **{issue.date_str}** - 😊 {issue.description}")
             report.append("")
 
         # 統計摘要
@@ -691,8 +753,6 @@ class AttendanceAnalyzer:
 
     def export_csv(self, filepath: str, merge: bool = False) -> None:
         """匯出CSV格式報告（委派至 lib.csv_exporter）"""
-        from lib import csv_exporter
-
         status_tuple = None
         # Auto-filled Friday WFH suggestions are calendar-derived, not
         # attendance-derived. Only suppress the status row when there are
@@ -709,43 +769,85 @@ class AttendanceAnalyzer:
             merge=merge,
         )
 
-    def export_excel(self, filepath: str) -> None:
-        """匯出Excel格式報告（直接使用 openpyxl，避免循環導入）"""
+    # 單一工作表超過此列數時自動分頁，避免 Excel 開啟巨型 sheet 過慢
+    EXCEL_SEGMENT_SIZE = 250_000
+
+    def export_excel(self, filepath: str, segment_size: int | None = None) -> None:
+        """匯出Excel格式報告（直接使用 openpyxl，避免循環導入）
+        Args:
+            filepath: 檔案路徑
+            segment_size: 單一工作表最大資料列數，超過即分頁；0 表示不分頁
+        """
+        if segment_size is None:
+            segment_size = self.EXCEL_SEGMENT_SIZE
         # Probe legacy exporter availability to keep warning behavior for tests
         try:
             from lib import excel_exporter  # noqa: F401
         except Exception:
             logger.warning("⚠️  警告: 未安裝 openpyxl，回退使用CSV格式")
             logger.info("💡 安裝指令: pip install openpyxl")
-            csv_filepath = filepath.replace(".xlsx", ".csv")
+            csv_filepath = os.path.splitext(filepath)[0] + ".csv"
             self.export_csv(csv_filepath)
             logger.info("✅ CSV報告已匯出: %s", csv_filepath)
             return
+        from lib import excel_exporter_fast
+
         try:
             from openpyxl import Workbook  # type: ignore
         except Exception:
             logger.warning("⚠️  警告: 未安裝 openpyxl，回退使用CSV格式")
             logger.info("💡 安裝指令: pip install openpyxl")
-            csv_filepath = filepath.replace(".xlsx", ".csv")
+            csv_filepath = os.path.splitext(filepath)[0] + ".csv"
             self.export_csv(csv_filepath)
             logger.info("✅ CSV報告已匯出: %s", csv_filepath)
             return
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "考勤分析"
         headers = ["日期", "類型", "時長(分鐘)", "說明", "時段", "計算式"]
         if self.incremental_mode:
             headers.append("狀態")
-        ws.append(headers)
+        sheets = self._build_excel_sheet_rows(segment_size)
+        # 分頁時第一頁補上 _1 後綴，後續依序編號
+        if len(sheets) == 1:
+            titles = ["考勤分析"]
+        else:
+            titles = [f"考勤分析_{i}" for i in range(1, len(sheets) + 1)]
+
+        # 巨量列數走 raw-XML 快速後端（lib.excel_exporter_fast）：
+        # 繞過 openpyxl 的 Python 層 cell 管線，輸出值等價
+        if len(self.issues) >= excel_exporter_fast.FAST_ROW_THRESHOLD:
+            excel_exporter_fast.save_xlsx_fast(
+                filepath,
+                [(title, [headers, *rows]) for title, rows in zip(titles, sheets, strict=True)],
+            )
+            return
+
+        wb = Workbook()
+        for idx, (title, rows) in enumerate(zip(titles, sheets, strict=True)):
+            ws = wb.active if idx == 0 else wb.create_sheet(title)
+            ws.title = title
+            ws.append(headers)
+            for row in rows:
+                ws.append(row)
+
+        # Atomic write
+        tmp_path = filepath + ".tmp"
+        wb.save(tmp_path)
+        import os as _os
+
+        _os.replace(tmp_path, filepath)
+        return
+
+    def _build_excel_sheet_rows(self, segment_size: int | None) -> list[list[list]]:
+        """組出各工作表的資料列（不含標題列），依 segment_size 分頁。"""
+        rows: list[list] = []
+        sheets = [rows]
 
-        # data_start_appended = False  # Variable assigned but never used
         non_wfh_issues = [i for i in self.issues if i.type != IssueType.WFH]
         if self.incremental_mode and not non_wfh_issues and self.current_user:
             status_tuple = self._compute_incremental_status_row()
             if status_tuple:
                 last_date, total, last_time = status_tuple
-                ws.append(
+                rows.append(
                     [
                         last_date,
                         "狀態資訊",
@@ -759,11 +861,15 @@ class AttendanceAnalyzer:
                         "系統狀態",
                     ]
                 )
-                # data_start_appended = True  # Variable assigned but never used
 
+        issue_rows_in_sheet = 0
         for issue in self.issues:
+            if segment_size and issue_rows_in_sheet >= segment_size:
+                rows = []
+                sheets.append(rows)
+                issue_rows_in_sheet = 0
             row = [
-                issue.date.strftime("%Y/%m/%d"),
+                issue.date_str,
                 issue.type.value,
                 issue.duration_minutes,
                 issue.description,
@@ -772,15 +878,9 @@ class AttendanceAnalyzer:
             ]
             if self.incremental_mode:
                 row.append("[NEW] 本次新發現" if issue.is_new else "已存在")
-            ws.append(row)
-
-        # Atomic write
-        tmp_path = filepath + ".tmp"
-        wb.save(tmp_path)
-        import os as _os
-
-        _os.replace(tmp_path, filepath)
-        return
+            rows.append(row)
+            issue_rows_in_sheet += 1
+        return sheets
 
     def _compute_incremental_status_row(self) -> tuple[str, int, str] | None:
         complete_days = self._identify_complete_work_days()
@@ -804,17 +904,17 @@ class AttendanceAnalyzer:
         filepath: str,
         format_type: str = "excel",
         export_policy: str = "merge",
+        segment_size: int | None = None,
     ) -> str | None:
         """統一匯出介面
         Args:
             filepath: 檔案路徑
             format_type: 'excel' 或 'csv'
+            segment_size: Excel 單一工作表最大列數（0 表示不分頁）
         """
         backup_path = None
 
         if export_policy == "archive":
-            from lib.backup import backup_with_timestamp
-
             backup_path = backup_with_timestamp(filepath)
             if backup_path:
                 logger.info("📦 備份現有檔案: %s", os.path.basename(backup_path))
@@ -824,7 +924,7 @@ class AttendanceAnalyzer:
         if format_type.lower() == "csv":
             self.export_csv(filepath, merge=(export_policy == "merge"))
         else:
-            self.export_excel(filepath)
+            self.export_excel(filepath, segment_size=segment_size)
 
         return backup_path
 
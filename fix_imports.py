@@ -1,144 +1,148 @@
 #!/usr/bin/env python3
 """Quick script to fix import sorting issues in Python files."""
 
-from pathlib import Path
+import os
+import tempfile
+
+# 模組層級預先建好分類集合：frozenset 查表 O(1)，
+# 避免每行 import 都重建 list 再線性掃描
+_STDLIB_MODULES = frozenset(
+    {
+        "os",
+        "sys",
+        "json",
+        "unittest",
+        "tempfile",
+        "datetime",
+        "pathlib",
+        "argparse",
+        "re",
+        "trace",
+        "io",
+        "uuid",
+        "shutil",
+        "logging",
+        "typing",
+        "contextlib",
+        "asyncio",
+    }
+)
+_LOCAL_MODULES = frozenset({"attendance_analyzer", "lib", "server"})
+_IMPORT_PREFIXES = ("import ", "from ")
+
+
+def _skip_header(lines):
+    """Return the index of the first line after shebang + module docstring."""
+    i = 0
+    if lines and lines[0].startswith("#!"):
+        i = 1
+    while i < len(lines) and not lines[i].strip():
+        i += 1
+    if i < len(lines) and lines[i].lstrip().startswith(('"""', "'''")):
+        quote = '"""' if lines[i].lstrip().startswith('"""') else "'''"
+        if lines[i].count(quote) >= 2:  # one-line docstring
+            return i + 1
+        i += 1
+        while i < len(lines) and quote not in lines[i]:
+            i += 1
+        return i + 1
+    return i
+
+
+def _sort_import_block(import_lines):
+    """Group imports stdlib → third-party → local, each group sorted."""
+    stdlib_imports = []
+    third_party_imports = []
+    local_imports = []
+
+    for line in import_lines:
+        module = line.split()[1].split(".")[0].rstrip(",")
+        if module in _STDLIB_MODULES:
+            stdlib_imports.append(line)
+        elif module in _LOCAL_MODULES:
+            local_imports.append(line)
+        else:
+            third_party_imports.append(line)
+
+    new_imports = []
+    for group in (stdlib_imports, third_party_imports, local_imports):
+        if group:
+            if new_imports:
+                new_imports.append("")
+            new_imports.extend(sorted(group))
+    return new_imports
 
 
 def fix_imports_in_file(filepath):
-    """Fix import sorting in a single Python file."""
-    with open(filepath, encoding="utf-8") as f:
-        content = f.read()
-
-    lines = content.split("\n")
-
-    # Find import blocks
-    i = 0
-    while i < len(lines):
-        # Skip shebang and module docstrings
-        if i == 0 and lines[i].startswith("#!"):
-            i += 1
-            continue
-        if i < len(lines) and (lines[i].startswith('"""') or lines[i].startswith("'''")):
-            # Skip docstring
-            if lines[i].count('"""') == 1 or lines[i].count("'''") == 1:
-                i += 1
-                quote = '"""' if '"""' in lines[i - 1] else "'''"
-                while i < len(lines) and quote not in lines[i]:
-                    i += 1
-            i += 1
-            continue
-
-        # Check if we're at the start of imports
-        if lines[i].startswith("import ") or lines[i].startswith("from "):
-            import_start = i
-            import_lines = []
-
-            # Collect all consecutive import lines
-            while i < len(lines) and (
-                lines[i].startswith("import ")
-                or lines[i].startswith("from ")
-                or lines[i].strip() == ""
-            ):
-                if lines[i].strip():
-                    import_lines.append(lines[i])
-                i += 1
-
-            if import_lines:
-                # Sort imports: stdlib first, then third-party, then local
-                stdlib_imports = []
-                third_party_imports = []
-                local_imports = []
-
-                for line in import_lines:
-                    if line.startswith("from "):
-                        module = line.split()[1].split(".")[0]
-                    else:
-                        module = line.split()[1].split(".")[0].rstrip(",")
-
-                    # Common stdlib modules
-                    if module in [
-                        "os",
-                        "sys",
-                        "json",
-                        "unittest",
-                        "tempfile",
-                        "datetime",
-                        "pathlib",
-                        "argparse",
-                        "re",
-                        "trace",
-                        "io",
-                        "uuid",
-                        "shutil",
-                        "logging",
-                        "typing",
-                        "contextlib",
-                        "asyncio",
-                    ]:
-                        stdlib_imports.append(line)
-                    elif module in ["attendance_analyzer", "lib", "server"]:
-                        local_imports.append(line)
-                    else:
-                        third_party_imports.append(line)
-
-                # Sort each group
-                stdlib_imports.sort()
-                third_party_imports.sort()
-                local_imports.sort()
-
-                # Reconstruct the import block
-                new_imports = []
-                if stdlib_imports:
-                    new_imports.extend(stdlib_imports)
-                if third_party_imports:
-                    if new_imports:
-                        new_imports.append("")
-                    new_imports.extend(third_party_imports)
-                if local_imports:
-                    if new_imports:
-                        new_imports.append("")
-                    new_imports.extend(local_imports)
-
-                # Replace in original lines
-                lines[import_start:i] = new_imports + [""]
-
-                # Update content
-                content = "\n".join(lines)
-
-                # Write back
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(content)
-                return True
+    """Fix import sorting in a single Python file.
 
+    Single pass: skip the header, take the first contiguous import block,
+    splice in the sorted block and write the file exactly once (atomic
+    tempfile + os.replace, no read-modify-rewrite loop).
+    """
+    with open(filepath, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+
+    i = _skip_header(lines)
+    while i < len(lines) and not lines[i].startswith(_IMPORT_PREFIXES):
+        stripped = lines[i].strip()
+        # 檔頭與 import 區塊間的空行與註解行照常略過；
+        # 碰到其他程式碼才結束（只處理檔頭 import 區塊）
+        if stripped and not stripped.startswith("#"):
+            return False
         i += 1
-
-    return False
+    if i >= len(lines):
+        return False
+
+    import_start = i
+    import_lines = []
+    while i < len(lines) and (lines[i].startswith(_IMPORT_PREFIXES) or not lines[i].strip()):
+        if lines[i].strip():
+            import_lines.append(lines[i])
+        i += 1
+    if not import_lines:
+        return False
+
+    new_imports = _sort_import_block(import_lines)
+    # 已排序好的檔案不重寫：避免無謂的磁碟寫入與 mtime 變動
+    # （會連帶讓 bytecode/linter 快取失效）
+    if [line for line in new_imports if line] == import_lines:
+        return False
+    lines[import_start:i] = new_imports + [""]
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filepath)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def _iter_py_files(directory):
+    """Yield paths of .py files via os.scandir (reuses dirent info, no per-entry stat)."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False) and entry.name.endswith(".py"):
+                yield entry.path
 
 
 def main():
     """Fix imports in all Python files."""
     fixed_count = 0
 
-    # Fix test files
-    test_dir = Path("test")
-    for py_file in test_dir.glob("*.py"):
-        if fix_imports_in_file(py_file):
-            print(f"Fixed imports in {py_file}")
-            fixed_count += 1
-
-    # Fix lib files
-    lib_dir = Path("lib")
-    for py_file in lib_dir.glob("*.py"):
-        if fix_imports_in_file(py_file):
-            print(f"Fixed imports in {py_file}")
-            fixed_count += 1
-
-    # Fix server files
-    server_dir = Path("server")
-    if server_dir.exists():
-        for py_file in server_dir.glob("*.py"):
+    for directory in ("test", "lib"):
+        for py_file in _iter_py_files(directory):
+            if fix_imports_in_file(py_file):
+                print(f"Fixed imports in {py_file}")
+                fixed_count += 1
+
+    if os.path.isdir("server"):
+        for py_file in _iter_py_files("server"):
             # Skip server/main.py as we've already fixed it manually
-            if py_file.name != "main.py" and fix_imports_in_file(py_file):
+            if os.path.basename(py_file) != "main.py" and fix_imports_in_file(py_file):
                 print(f"Fixed imports in {py_file}")
                 fixed_count += 1
 
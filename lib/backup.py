@@ -1,5 +1,5 @@
 import os
-from datetime import datetime
+import time
 
 
 def backup_with_timestamp(filepath: str) -> str | None:
@@ -7,11 +7,13 @@ def backup_with_timestamp(filepath: str) -> str | None:
 
     Returns the backup path if a backup was created, otherwise None.
     """
-    if not os.path.exists(filepath):
-        return None
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # time.strftime 直接走 C 實作，不用為了格式化先建 datetime 物件
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     base_name, ext = os.path.splitext(filepath)
     backup_filepath = f"{base_name}_{timestamp}{ext}"
-    os.rename(filepath, backup_filepath)
+    # EAFP：直接 rename，少一次 exists() 的 stat syscall
+    try:
+        os.rename(filepath, backup_filepath)
+    except FileNotFoundError:
+        return None
     return backup_filepath
@@ -7,30 +7,48 @@ historical `python attendance_analyzer.py <file>` invocation still
 works without changes.
 
 Subcommand handlers live in `lib/commands/`. Each module exposes
-`add_parser(subparsers)` and `run(args)`.
+`add_parser(subparsers)` and `run(args)`; they are registered here in a
+single table so parser setup and dispatch share one source of truth.
 """
 
 from __future__ import annotations
 
-import argparse
+import functools
+import importlib
 import sys
 
-KNOWN_SUBCOMMANDS = {
+# 子命令 → lib.commands 模組名；dash/underscore 皆為合法別名
+_COMMAND_MODULES = {
+    "analyze": "analyze",
+    "export": "export",
+    "import": "import_",
+    "portal-fetch": "portal_fetch",
+    "portal_fetch": "portal_fetch",
+    "portal-sync": "portal_sync",
+    "portal_sync": "portal_sync",
+    "portal-check": "portal_check",
+    "portal_check": "portal_check",
+    "portal-balances": "portal_balances",
+    "portal_balances": "portal_balances",
+    "portal-apply": "portal_apply",
+    "portal_apply": "portal_apply",
+    "reasons": "reasons",
+}
+
+KNOWN_SUBCOMMANDS = frozenset(_COMMAND_MODULES)
+
+# subparser 只註冊一次（underscore 別名由 dispatch 表吸收）
+_PARSER_MODULES = (
     "analyze",
     "export",
-    "import",
-    "portal-fetch",
+    "import_",
     "portal_fetch",
-    "portal-sync",
     "portal_sync",
-    "portal-check",
     "portal_check",
-    "portal-balances",
     "portal_balances",
-    "portal-apply",
     "portal_apply",
     "reasons",
-}
+)
 
 
 _TOP_LEVEL_HELP_FLAGS = {"-h", "--help"}
@@ -56,7 +74,10 @@ def _looks_like_legacy_invocation(argv: list[str]) -> bool:
     return not any(a in KNOWN_SUBCOMMANDS for a in argv)
 
 
-def build_parser() -> argparse.ArgumentParser:
+@functools.lru_cache(maxsize=1)
+def build_parser():
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="fhr",
         description="考勤分析系統 - 支援增量分析、Portal 介接、外部工具互通",
@@ -66,27 +87,8 @@ def build_parser() -> argparse.ArgumentParser:
 
     # Lazy import each handler — keeps top-level help fast and lets
     # individual commands skip importing heavy deps until selected.
-    from lib.commands import (
-        analyze as analyze_cmd,
-        export as export_cmd,
-        import_ as import_cmd,
-        portal_apply as portal_apply_cmd,
-        portal_balances as portal_balances_cmd,
-        portal_check as portal_check_cmd,
-        portal_fetch as portal_fetch_cmd,
-        portal_sync as portal_sync_cmd,
-        reasons as reasons_cmd,
-    )
-
-    analyze_cmd.add_parser(sub)
-    export_cmd.add_parser(sub)
-    import_cmd.add_parser(sub)
-    portal_fetch_cmd.add_parser(sub)
-    portal_sync_cmd.add_parser(sub)
-    portal_check_cmd.add_parser(sub)
-    portal_balances_cmd.add_parser(sub)
-    portal_apply_cmd.add_parser(sub)
-    reasons_cmd.add_parser(sub)
+    for module_name in _PARSER_MODULES:
+        importlib.import_module(f"lib.commands.{module_name}").add_parser(sub)
     return parser
 
 
@@ -98,41 +100,7 @@ def run(argv: list | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(raw)
 
-    if args.cmd == "analyze":
-        from lib.commands import analyze as analyze_cmd
-
-        analyze_cmd.run(args)
-    elif args.cmd == "export":
-        from lib.commands import export as export_cmd
-
-        export_cmd.run(args)
-    elif args.cmd == "import":
-        from lib.commands import import_ as import_cmd
-
-        import_cmd.run(args)
-    elif args.cmd in ("portal-fetch", "portal_fetch"):
-        from lib.commands import portal_fetch as portal_fetch_cmd
-
-        portal_fetch_cmd.run(args)
-    elif args.cmd in ("portal-sync", "portal_sync"):
-        from lib.commands import portal_sync as portal_sync_cmd
-
-        portal_sync_cmd.run(args)
-    elif args.cmd in ("portal-check", "portal_check"):
-        from lib.commands import portal_check as portal_check_cmd
-
-        portal_check_cmd.run(args)
-    elif args.cmd in ("portal-balances", "portal_balances"):
-        from lib.commands import portal_balances as portal_balances_cmd
-
-        portal_balances_cmd.run(args)
-    elif args.cmd in ("portal-apply", "portal_apply"):
-        from lib.commands import portal_apply as portal_apply_cmd
-
-        portal_apply_cmd.run(args)
-    elif args.cmd == "reasons":
-        from lib.commands import reasons as reasons_cmd
-
-        reasons_cmd.run(args)
-    else:
+    module_name = _COMMAND_MODULES.get(args.cmd)
+    if module_name is None:
         parser.error(f"unknown subcommand: {args.cmd}")
+    importlib.import_module(f"lib.commands.{module_name}").run(args)
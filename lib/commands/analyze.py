@@ -10,7 +10,7 @@ import argparse
 import logging
 import os
 import sys
-from datetime import datetime
+from pathlib import Path
 
 
 def add_parser(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
@@ -67,6 +67,12 @@ def add_parser(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParse
         action="store_true",
         help="清除 timestamp 備份；搭配 --debug 時同時刪除本次產出的匯出檔案。",
     )
+    parser.add_argument(
+        "--segment-size",
+        type=int,
+        default=250_000,
+        help="Excel 單一工作表最大資料列數，超過即自動分頁（0 表示不分頁）。",
+    )
     parser.add_argument(
         "--unprocessed-only",
         "-u",
@@ -76,6 +82,23 @@ def add_parser(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParse
     return parser
 
 
+def _existing(paths: list[str]) -> set[str]:
+    """批次檢查存在性：每個目錄 scandir 一次，取代逐檔 os.path.exists 的 stat。"""
+    by_dir: dict[str, set[str]] = {}
+    for path in paths:
+        abs_path = os.path.abspath(path)
+        by_dir.setdefault(os.path.dirname(abs_path), set()).add(abs_path)
+    found: set[str] = set()
+    for dirname, wanted in by_dir.items():
+        try:
+            with os.scandir(dirname) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            continue
+        found.update(p for p in wanted if os.path.basename(p) in names)
+    return found
+
+
 def run(args: argparse.Namespace) -> None:
     from attendance_analyzer import AttendanceAnalyzer, logger
     from lib.filename import parse_range_and_user
@@ -92,6 +115,9 @@ def run(args: argparse.Namespace) -> None:
         logger.debug("🐞 CLI Debug 模式啟動：將略過狀態寫入並輸出詳細訊息。")
 
     if args.reset_state:
+        # 只有 reset-state 分支需要時間戳，延後載入以縮短一般路徑的冷啟動
+        import time
+
         user_name, _, _ = parse_range_and_user(filepath)
         if user_name:
             state_manager = AttendanceStateManager(read_only=args.debug)
@@ -103,7 +129,7 @@ def run(args: argparse.Namespace) -> None:
                 logger.info(
                     "🗑️  狀態檔 'attendance_state.json' 已清除使用者 %s 的記錄 @ %s",
                     user_name,
-                    datetime.now().isoformat(),
+                    time.strftime("%Y-%m-%dT%H:%M:%S"),
                 )
             else:
                 logger.info("ℹ️  使用者 %s 沒有現有狀態需要清除", user_name)
@@ -121,6 +147,13 @@ def run(args: argparse.Namespace) -> None:
 
         analyzer.parse_attendance_file(filepath, incremental=incremental_mode)
 
+        # 快速判斷：重複執行且沒有新工作日時，後續的分組/分析/備份/匯出
+        # 全是重寫相同結果，直接略過。--cleanup-exports 需要走到後面的
+        # 清理區塊（舊 timestamp 備份正是這種重複執行的產物），不可快速退出
+        if incremental_mode and not cleanup_exports and not analyzer.has_unprocessed_work():
+            logger.info("✅ 增量分析: 沒有新的工作日需要處理，略過分析與匯出")
+            return
+
         logger.info("📝 正在分組記錄...")
         analyzer.group_records_by_day()
 
@@ -130,15 +163,20 @@ def run(args: argparse.Namespace) -> None:
         logger.info("📊 正在生成報告...")
         report = analyzer.generate_report()
 
-        logger.info("\n")
-        for line in report.split("\n"):
-            logger.info(line)
+        # 一次輸出整份報告：逐行 logger.info 會對每行做格式化與 handler 派送，
+        # 長報告等於數百次 I/O；report 本身已是 join 好的字串。
+        logger.info("\n%s", report)
 
         exported_files: list[str] = []
         backup_files: list[str] = []
 
+        # 以 pathlib 組輸出路徑：str.replace 會誤傷檔名中段的 ".txt"
+        # （如 2025.txt.bak），且副檔名非 .txt 時會直接覆寫輸入檔
+        source_path = Path(filepath)
+        analysis_base = source_path.with_name(source_path.stem + "_analysis")
+
         if format_type.lower() == "csv":
-            output_filepath = filepath.replace(".txt", "_analysis.csv")
+            output_filepath = str(analysis_base.with_suffix(".csv"))
             backup_path = analyzer.export_report(
                 output_filepath, "csv", export_policy=export_policy
             )
@@ -147,9 +185,12 @@ def run(args: argparse.Namespace) -> None:
                 backup_files.append(backup_path)
             logger.info("✅ CSV報告已匯出: %s", output_filepath)
         else:
-            output_filepath = filepath.replace(".txt", "_analysis.xlsx")
+            output_filepath = str(analysis_base.with_suffix(".xlsx"))
             backup_path = analyzer.export_report(
-                output_filepath, "excel", export_policy=export_policy
+                output_filepath,
+                "excel",
+                export_policy=export_policy,
+                segment_size=args.segment_size,
             )
             exported_files.append(output_filepath)
             if backup_path:
@@ -157,7 +198,7 @@ def run(args: argparse.Namespace) -> None:
             logger.info("✅ Excel報告已匯出: %s", output_filepath)
 
         if format_type.lower() == "excel":
-            csv_filepath = filepath.replace(".txt", "_analysis.csv")
+            csv_filepath = str(analysis_base.with_suffix(".csv"))
             backup_path = analyzer.export_report(csv_filepath, "csv", export_policy=export_policy)
             exported_files.append(csv_filepath)
             if backup_path:
@@ -170,19 +211,13 @@ def run(args: argparse.Namespace) -> None:
                 list_backups,
             )
 
-            timestamp_candidates: set[str] = set()
-            for path in exported_files:
-                for candidate in list_backups(path):
-                    timestamp_candidates.add(os.path.abspath(candidate))
-            for backup in backup_files:
-                if os.path.exists(backup):
-                    timestamp_candidates.add(os.path.abspath(backup))
+            timestamp_candidates = {
+                os.path.abspath(candidate)
+                for path in exported_files
+                for candidate in list_backups(path)
+            } | _existing(backup_files)
 
-            canonical_candidates: set[str] = set()
-            if args.debug:
-                for path in exported_files:
-                    if os.path.exists(path):
-                        canonical_candidates.add(os.path.abspath(path))
+            canonical_candidates = _existing(exported_files) if args.debug else set()
 
             if not timestamp_candidates and not canonical_candidates:
                 logger.info("ℹ️ 沒有可清除的匯出檔案")
@@ -202,9 +237,11 @@ def run(args: argparse.Namespace) -> None:
                         removed = cleanup_exports_helper(path, include_canonical=args.debug)
                         removed_paths.update(os.path.abspath(p) for p in removed)
                     for backup in backup_files:
-                        if os.path.exists(backup):
+                        try:
                             os.remove(backup)
-                            removed_paths.add(os.path.abspath(backup))
+                        except FileNotFoundError:
+                            continue
+                        removed_paths.add(os.path.abspath(backup))
                     if removed_paths:
                         removed_display = ", ".join(
                             sorted(os.path.basename(p) for p in removed_paths)
@@ -177,8 +177,8 @@ def run(args: argparse.Namespace) -> None:
     pending = {k: filter_since(v, args.since) for k, v in pending_raw.items()}
 
     report, clean = format_report(rejected, pending, args.since)
-    for line in report.splitlines():
-        logger.info("%s", line)
+    # 整份報告一次輸出：逐行 logger.info 會對每行各跑一次 formatter/handler
+    logger.info("%s", report)
     if not clean:
         # Non-zero exit so scripted use (`fhr portal-check && fhr portal-apply`)
         # stops when rejected / in-flow forms need attention first.
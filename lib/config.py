@@ -1,8 +1,23 @@
+import functools
 from dataclasses import dataclass
+from datetime import time
 
 
-@dataclass
+@functools.lru_cache(maxsize=32)
+def _parse_hhmm(value: str) -> time:
+    """把 "HH:MM" 字串解析成 datetime.time（同字串只解析一次）。"""
+    hour, minute = value.split(":")
+    return time(int(hour), int(minute))
+
+
+@dataclass(frozen=True, slots=True)
 class AttendanceConfig:
+    """公司規則設定。
+
+    frozen + slots：省掉每實例 __dict__ 並可雜湊；設定檔覆寫走
+    `dataclasses.replace` 產生新實例，而非就地 setattr。
+    """
+
     schedule_start: str = "09:30"  # 個人班表起始時間
     schedule_end: str = "18:30"  # 個人班表結束時間
     earliest_checkin: str = "08:30"
@@ -17,3 +32,28 @@ class AttendanceConfig:
     # 一律走請假；下列欄位目前未被分析流程使用，保留供未來手動工具參考。
     forget_punch_allowance_per_month: int = 2
     forget_punch_max_minutes: int = 60
+
+    # 預先解析好的 time 物件：下游可直接比較 time，不用每次 strptime
+    @property
+    def schedule_start_time(self) -> time:
+        return _parse_hhmm(self.schedule_start)
+
+    @property
+    def schedule_end_time(self) -> time:
+        return _parse_hhmm(self.schedule_end)
+
+    @property
+    def earliest_checkin_time(self) -> time:
+        return _parse_hhmm(self.earliest_checkin)
+
+    @property
+    def latest_checkin_time(self) -> time:
+        return _parse_hhmm(self.latest_checkin)
+
+    @property
+    def lunch_start_time(self) -> time:
+        return _parse_hhmm(self.lunch_start)
+
+    @property
+    def lunch_end_time(self) -> time:
+        return _parse_hhmm(self.lunch_end)
@@ -1,14 +1,26 @@
+import codecs
 import csv
+import functools
+import io
 import os
-from collections import OrderedDict
+import tempfile
 from collections.abc import Iterable
+from itertools import chain, islice
+
+
+@functools.lru_cache(maxsize=1024)
+def _fmt_date(d) -> str:
+    """同日期多筆 issue 時只跑一次 strftime（fallback 路徑用）。"""
+    return d.strftime("%Y/%m/%d")
+
+
+# 標題列固定不變：模組層級建一次，呼叫端只讀不改
+_HEADER = ("日期", "類型", "時長(分鐘)", "說明", "時段", "計算式")
+_HEADER_INCREMENTAL = _HEADER + ("狀態",)
 
 
 def _header_row(incremental_mode: bool) -> list[str]:
-    headers = ["日期", "類型", "時長(分鐘)", "說明", "時段", "計算式"]
-    if incremental_mode:
-        headers.append("狀態")
-    return headers
+    return list(_HEADER_INCREMENTAL if incremental_mode else _HEADER)
 
 
 def _status_row(last_date: str, complete_days: int, last_analysis_time: str) -> list[str]:
@@ -28,7 +40,7 @@ def _status_row(last_date: str, complete_days: int, last_analysis_time: str) ->
 
 def _issue_row(issue, incremental_mode: bool) -> list[str]:
     row = [
-        issue.date.strftime("%Y/%m/%d"),
+        getattr(issue, "date_str", "") or _fmt_date(issue.date),
         issue.type.value,
         issue.duration_minutes,
         issue.description,
@@ -56,18 +68,24 @@ def write_issue_rows(writer: csv.writer, issues: Iterable, incremental_mode: boo
 
 
 def _build_rows(
-    issues: list[object], incremental_mode: bool, status: tuple | None = None
+    issues: Iterable, incremental_mode: bool, status: tuple | None = None
 ) -> list[list[str]]:
-    rows: list[list[str]] = []
-    rows.append(_header_row(incremental_mode))
+    """Build header + optional status row + issue rows in one pass.
+
+    `issues` may be any iterable (consumed exactly once, never
+    materialized up front).
+    """
+    rows: list[list[str]] = [_header_row(incremental_mode)]
+    has_non_wfh = False
+    for issue in issues:
+        if getattr(getattr(issue, "type", None), "name", "") != "WFH":
+            has_non_wfh = True
+        rows.append(_issue_row(issue, incremental_mode))
     # Auto-filled Friday WFH suggestions are calendar-derived, so they should
     # not suppress the "all dates processed" status row.
-    non_wfh_issues = [i for i in issues if getattr(getattr(i, "type", None), "name", "") != "WFH"]
-    if status and incremental_mode and not non_wfh_issues:
+    if status and incremental_mode and not has_non_wfh:
         last_date, complete_days, last_analysis_time = status
-        rows.append(_status_row(last_date, complete_days, last_analysis_time))
-    for issue in issues:
-        rows.append(_issue_row(issue, incremental_mode))
+        rows.insert(1, _status_row(last_date, complete_days, last_analysis_time))
     return rows
 
 
@@ -95,30 +113,27 @@ def _is_wfh_row(row: list[str]) -> bool:
     return len(row) > 1 and row[1] in {"WFH", "WFH假"}
 
 
-def _merge_rows(existing: list[list[str]], new_rows: list[list[str]]) -> list[list[str]]:
+def _merge_rows(existing: Iterable[list[str]], new_rows: list[list[str]]) -> list[list[str]]:
     """Merge existing CSV rows with new rows, deduplicating by key.
 
     New rows take precedence over existing ones with the same key.
     Status rows are kept when the final result has no actionable non-WFH rows.
+    `existing` may be any iterable (e.g. a csv.reader being streamed);
+    its first row is treated as the header and skipped.
     """
     header = new_rows[0]
     width = len(header)
-    merged = OrderedDict()
-
-    # First, add existing rows (excluding header)
-    if existing:
-        for row in existing[1:]:  # Skip existing header
-            if not row:
-                continue
-            normalized = _normalize_row(row, width)
-            merged[_row_key(normalized)] = normalized
-
-    # Then add/update with new rows (they take precedence)
-    for row in new_rows[1:]:
-        if not row:
-            continue
-        normalized = _normalize_row(row, width)
-        merged[_row_key(normalized)] = normalized
+
+    # 單一 dict-comprehension 同時正規化與建 key：existing 先進、新列後進，
+    # 後寫入的 key 覆蓋先前值，所以新列仍然優先
+    merged = {
+        _row_key(normalized): normalized
+        for normalized in (
+            _normalize_row(row, width)
+            for row in chain(islice(iter(existing), 1, None), new_rows[1:])
+            if row
+        )
+    }
 
     # WFH suggestions are calendar-derived, so they should not suppress
     # the "all dates processed" status row during incremental CSV merge.
@@ -129,11 +144,7 @@ def _merge_rows(existing: list[list[str]], new_rows: list[list[str]]) -> list[li
     result: list[list[str]] = [header]
 
     # Extract status row if present
-    status_key = None
-    for key in list(merged):
-        if key and key[0] == "STATUS":
-            status_key = key
-            break
+    status_key = next((key for key in merged if key and key[0] == "STATUS"), None)
 
     # Only include status row if there are NO other data rows
     if status_key is not None:
@@ -149,6 +160,20 @@ def _merge_rows(existing: list[list[str]], new_rows: list[list[str]]) -> list[li
     return result
 
 
+# 欄位固定且絕大多數不含分隔符/引號/換行；安全列直接 join，
+# 只有例外列才走 csv 模組的 quoting 狀態機（輸出與 csv.writer 等價）
+_NEEDS_QUOTING = ('"', ";", "\n", "\r")
+
+
+def _format_line(row: list) -> str:
+    fields = [field if isinstance(field, str) else str(field) for field in row]
+    if any(ch in field for field in fields for ch in _NEEDS_QUOTING):
+        buf = io.StringIO()
+        csv.writer(buf, delimiter=";").writerow(row)
+        return buf.getvalue()
+    return ";".join(fields) + "\r\n"
+
+
 def save_csv(
     filepath: str,
     issues: Iterable,
@@ -162,21 +187,30 @@ def save_csv(
     merge: when True, rewrite the canonical export in place (no timestamped backup).
     """
 
-    issues_list = list(issues)
-    rows = _build_rows(issues_list, incremental_mode, status)
+    rows = _build_rows(issues, incremental_mode, status)
 
     if merge and os.path.exists(filepath):
-        # Read existing CSV data for merging
-        existing_rows: list[list[str]] = []
+        # Stream the existing CSV straight into the merge — no intermediate
+        # list(reader); a 1 MiB buffer keeps read syscalls low on big exports
         try:
-            with open(filepath, encoding="utf-8-sig") as f:
-                reader = csv.reader(f, delimiter=";")
-                existing_rows = list(reader)
+            with open(filepath, encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
+                rows = _merge_rows(csv.reader(f, delimiter=";"), rows)
         except (FileNotFoundError, OSError):
             # If file doesn't exist or can't be read, proceed with new rows only
-            existing_rows = []
-        rows = _merge_rows(existing_rows, rows)
-
-    with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.writer(f, delimiter=";")
-        writer.writerows(rows)
+            pass
+
+    # 先在記憶體組好整份輸出再一次寫入：避免 TextIOWrapper 逐段 flush
+    # 的多次 write syscall；BOM 手動前置以維持 utf-8-sig 相容。
+    # 寫入暫存檔後 os.replace：中途當機不會留下半寫的主檔
+    # （merge 路徑會把主檔當作權威資料重讀）
+    payload = codecs.BOM_UTF8 + "".join(map(_format_line, rows)).encode("utf-8")
+    dirname = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix=".csv.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
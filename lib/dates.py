@@ -3,37 +3,67 @@
 No dependency on analyzer types; operate on duck-typed records.
 """
 
-from collections import defaultdict
+import operator
 from collections.abc import Iterable
 from datetime import datetime
 
+# attrgetter 是 C 函式：一次呼叫取回屬性，省去熱迴圈中逐次 getattr 的
+# 名稱查找；缺屬性的鴨子型別紀錄走 AttributeError 慢路徑跳過
+_get_date = operator.attrgetter("date")
+_get_date_type = operator.attrgetter("date", "type")
+
+# 延遲解析 AttendanceType.CHECKIN：Enum 成員指標比較比 .name 描述器
+# （DynamicClassAttribute）+ 字串比較快；頂層不 import analyzer 型別
+# 以避免循環導入。鴨子型別紀錄仍走 name 字串慢路徑。
+_CHECKIN = None
+
+
+def checkin_member():
+    global _CHECKIN
+    if _CHECKIN is None:
+        try:
+            from attendance_analyzer import AttendanceType
+
+            _CHECKIN = AttendanceType.CHECKIN
+        except ImportError:
+            _CHECKIN = False
+    return _CHECKIN
+
 
 def years_from_records(records: Iterable) -> set[int]:
     years: set[int] = set()
+    years_add = years.add
     for rec in records:
-        d = getattr(rec, "date", None)
+        try:
+            d = _get_date(rec)
+        except AttributeError:
+            continue
         if d:
-            years.add(d.year)
+            years_add(d.year)
     return years
 
 
 def identify_complete_work_days(records: Iterable) -> list[datetime]:
     """Return sorted list of dates (at 00:00) that have both checkin and checkout."""
-    daily = defaultdict(lambda: {"checkin": False, "checkout": False})
+    # 兩個 set + C 層級交集，取代 dict-per-date 的多次雜湊查找
+    checkins: set = set()
+    checkouts: set = set()
+    checkins_add = checkins.add
+    checkouts_add = checkouts.add
+    checkin = checkin_member()
     for rec in records:
-        d = getattr(rec, "date", None)
+        try:
+            d, t = _get_date_type(rec)
+        except AttributeError:
+            continue
         if not d:
             continue
-        t = getattr(rec, "type", None)
+        if t is checkin:
+            checkins_add(d)
+            continue
         # support Enum with .name or direct string
         name = getattr(t, "name", None) or str(t)
-        if name == "CHECKIN":
-            daily[d]["checkin"] = True
-        else:
-            daily[d]["checkout"] = True
-
-    out: list[datetime] = []
-    for d, flags in daily.items():
-        if flags["checkin"] and flags["checkout"]:
-            out.append(datetime.combine(d, datetime.min.time()))
-    return sorted(out)
+        (checkins_add if name == "CHECKIN" else checkouts_add)(d)
+
+    midnight = datetime.min.time()
+    return sorted(datetime.combine(d, midnight) for d in checkins & checkouts)
@@ -1,6 +1,7 @@
 """Excel export helpers for attendance analyzer."""
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import (
     Alignment,
     Border,
@@ -12,15 +13,36 @@ from openpyxl.worksheet.worksheet import Worksheet
 
 from attendance_analyzer import Issue, IssueType
 
+# 樣式物件建一次重複引用：openpyxl 樣式迴圈的主要成本是樣式物件
+# 建構與 Style-table 去重，逐列 new PatternFill 會放大 O(rows) 倍
+_TYPE_FILLS = {
+    IssueType.LATE: PatternFill(start_color="FFFFE6E6", end_color="FFFFE6E6", fill_type="solid"),
+    IssueType.OVERTIME: PatternFill(
+        start_color="FFE6F3FF", end_color="FFE6F3FF", fill_type="solid"
+    ),
+    IssueType.WFH: PatternFill(start_color="FFE6FFE6", end_color="FFE6FFE6", fill_type="solid"),
+    IssueType.FORGET_PUNCH: PatternFill(
+        start_color="FFFFF0E6", end_color="FFFFF0E6", fill_type="solid"
+    ),
+}
+_NEW_FILL = _TYPE_FILLS[IssueType.WFH]  # [NEW] 狀態沿用淺綠
+# Enum .value 也是描述器呼叫：預先建表，逐列查 dict 即可
+_TYPE_VALUE = {t: t.value for t in IssueType}
+_GRAY_FILL = PatternFill(start_color="FFF5F5F5", end_color="FFF5F5F5", fill_type="solid")
+
 
 def init_workbook() -> tuple[Workbook, Worksheet, Font, PatternFill, Border, Alignment]:
-    """Initialize workbook, worksheet, and basic styles."""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "考勤分析"
+    """Initialize write-only workbook, worksheet, and basic styles.
+
+    write-only 模式逐列序列化，不在記憶體建整棵 Cell 樹：大量問題列時
+    匯出近乎常數記憶體。代價是只能順序 append（不可回頭讀寫儲存格），
+    且欄寬需在寫入第一列前設定 — 先呼叫 set_column_widths 再寫列。
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("考勤分析")
 
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFFFF")
+    header_fill = PatternFill(start_color="FF366092", end_color="FF366092", fill_type="solid")
     border = Border(
         left=Side(style="thin"),
         right=Side(style="thin"),
@@ -41,13 +63,15 @@ def write_headers(
     alignment: Alignment,
 ) -> None:
     """Write header row with styles."""
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col)
-        cell.value = header
+    row = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
         cell.font = header_font
         cell.fill = header_fill
         cell.alignment = alignment
         cell.border = border
+        row.append(cell)
+    ws.append(row)
 
 
 def write_status_row(
@@ -59,24 +83,28 @@ def write_status_row(
     alignment: Alignment,
 ) -> int:
     """Write incremental status row and return next data row."""
-    ws.cell(row=2, column=1).value = last_date
-    ws.cell(row=2, column=2).value = "狀態資訊"
-    ws.cell(row=2, column=3).value = 0
     status_message = (
         f"📊 增量分析完成，已處理至 {last_date}，共 {complete_days} 個完整工作日 | "
         f"上次分析時間: {last_analysis_time}"
     )
-    ws.cell(row=2, column=4).value = status_message
-    ws.cell(row=2, column=5).value = ""
-    ws.cell(row=2, column=6).value = "上次處理範圍內無新問題需要申請"
-    ws.cell(row=2, column=7).value = "系統狀態"
-    gray_fill = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
-    for col in range(1, 8):
-        cell = ws.cell(row=2, column=col)
-        cell.fill = gray_fill
+    values = [
+        last_date,
+        "狀態資訊",
+        0,
+        status_message,
+        "",
+        "上次處理範圍內無新問題需要申請",
+        "系統狀態",
+    ]
+    row = []
+    for col, value in enumerate(values, 1):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.fill = _GRAY_FILL
         cell.border = border
         if col in [1, 2, 3, 5, 7]:
             cell.alignment = alignment
+        row.append(cell)
+    ws.append(row)
     return 3
 
 
@@ -88,61 +116,49 @@ def write_issue_rows(
     border: Border,
     alignment: Alignment,
 ) -> None:
-    """Write issue rows into the worksheet."""
-    for row_idx, issue in enumerate(issues, start_row):
-        date_cell = ws.cell(row=row_idx, column=1)
-        date_cell.value = issue.date.strftime("%Y/%m/%d")
+    """Stream issue rows into the worksheet.
+
+    start_row 保留供呼叫端相容（write-only 只能依序 append，不再需要
+    明確列號）。
+    """
+    del start_row
+    for issue in issues:
+        date_cell = WriteOnlyCell(ws, value=issue.date.strftime("%Y/%m/%d"))
         date_cell.alignment = alignment
         date_cell.border = border
 
-        type_cell = ws.cell(row=row_idx, column=2)
-        type_cell.value = issue.type.value
+        type_cell = WriteOnlyCell(ws, value=_TYPE_VALUE[issue.type])
         type_cell.alignment = alignment
         type_cell.border = border
-        if issue.type == IssueType.LATE:
-            type_cell.fill = PatternFill(
-                start_color="FFE6E6", end_color="FFE6E6", fill_type="solid"
-            )
-        elif issue.type == IssueType.OVERTIME:
-            type_cell.fill = PatternFill(
-                start_color="E6F3FF", end_color="E6F3FF", fill_type="solid"
-            )
-        elif issue.type == IssueType.WFH:
-            type_cell.fill = PatternFill(
-                start_color="E6FFE6", end_color="E6FFE6", fill_type="solid"
-            )
-        elif issue.type == IssueType.FORGET_PUNCH:
-            type_cell.fill = PatternFill(
-                start_color="FFF0E6", end_color="FFF0E6", fill_type="solid"
-            )
-
-        duration_cell = ws.cell(row=row_idx, column=3)
-        duration_cell.value = issue.duration_minutes
+        type_fill = _TYPE_FILLS.get(issue.type)
+        if type_fill is not None:
+            type_cell.fill = type_fill
+
+        duration_cell = WriteOnlyCell(ws, value=issue.duration_minutes)
         duration_cell.alignment = alignment
         duration_cell.border = border
 
-        desc_cell = ws.cell(row=row_idx, column=4)
-        desc_cell.value = issue.description
+        desc_cell = WriteOnlyCell(ws, value=issue.description)
         desc_cell.border = border
 
-        range_cell = ws.cell(row=row_idx, column=5)
-        range_cell.value = issue.time_range
+        range_cell = WriteOnlyCell(ws, value=issue.time_range)
         range_cell.alignment = alignment
         range_cell.border = border
 
-        calc_cell = ws.cell(row=row_idx, column=6)
-        calc_cell.value = issue.calculation
+        calc_cell = WriteOnlyCell(ws, value=issue.calculation)
         calc_cell.border = border
 
+        row = [date_cell, type_cell, duration_cell, desc_cell, range_cell, calc_cell]
+
         if incremental_mode:
-            status_cell = ws.cell(row=row_idx, column=7)
-            status_cell.value = "[NEW] 本次新發現" if issue.is_new else "已存在"
+            status_cell = WriteOnlyCell(ws, value="[NEW] 本次新發現" if issue.is_new else "已存在")
             status_cell.alignment = alignment
             status_cell.border = border
             if issue.is_new:
-                status_cell.fill = PatternFill(
-                    start_color="E6FFE6", end_color="E6FFE6", fill_type="solid"
-                )
+                status_cell.fill = _NEW_FILL
+            row.append(status_cell)
+
+        ws.append(row)
 
 
 def set_column_widths(ws, incremental_mode: bool) -> None:
@@ -151,6 +167,8 @@ def set_column_widths(ws, incremental_mode: bool) -> None:
     - Description (D) wider for readability
     - Calculation (F) widest; wider when incremental_mode is on
     - Status (G) visible without wrapping when incremental_mode is on
+
+    write-only 模式下需在寫入任何資料列前呼叫，否則欄寬不會被序列化。
     """
     col_count = 7 if incremental_mode else 6
     for col in range(1, col_count + 1):
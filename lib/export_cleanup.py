@@ -1,25 +1,31 @@
 """Helpers for cleaning up generated export files."""
 
+import functools
 import logging
 import os
 import re
+import stat as stat_module
 
 logger = logging.getLogger(__name__)
 
-_TIMESTAMP_RE = re.compile(r"\d{8}_\d{6}$")
 
+@functools.lru_cache(maxsize=32)
+def _scan_dir(directory: str, mtime_ns: int) -> tuple[str, ...]:
+    """同目錄多個匯出檔共用一次掃描；mtime_ns 入 key 自動失效。
+
+    scandir 的 DirEntry.is_file() 通常免額外 stat，順帶過濾子目錄。
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return tuple(entry.name for entry in entries if entry.is_file())
+    except OSError:
+        return ()
 
-def _match_timestamped_filename(stem: str, ext: str, candidate: str) -> bool:
-    if not candidate.startswith(stem + "_"):
-        return False
-    if ext and not candidate.endswith(ext):
-        return False
-    if ext:
-        end = len(candidate) - len(ext)
-        middle = candidate[len(stem) + 1 : end]
-    else:
-        middle = candidate[len(stem) + 1 :]
-    return bool(_TIMESTAMP_RE.fullmatch(middle))
+
+@functools.lru_cache(maxsize=64)
+def _timestamped_re(stem: str, ext: str) -> re.Pattern:
+    """單一正規式比對整個檔名，取代 startswith/endswith/切片組合。"""
+    return re.compile(re.escape(stem) + r"_\d{8}_\d{6}" + re.escape(ext) + r"\Z")
 
 
 def list_backups(filepath: str) -> list[str]:
@@ -42,28 +48,23 @@ def list_backups(filepath: str) -> list[str]:
     directory, filename = os.path.split(filepath)
     directory = directory or "."
 
-    # Validate directory exists and is accessible
-    if not os.path.isdir(directory):
-        return []
-
-    stem, ext = os.path.splitext(filename)
-    backups: list[str] = []
-
+    # Validate directory exists and is accessible（stat 一次，結果同時當快取 key）
     try:
-        for candidate in os.listdir(directory):
-            # Only consider files in the same directory (no subdirectories)
-            if os.sep in candidate or candidate in (".", ".."):
-                continue
-
-            if _match_timestamped_filename(stem, ext, candidate):
-                backup_path = os.path.join(directory, candidate)
-                # Double-check the resolved path is within the expected directory
-                if os.path.dirname(os.path.abspath(backup_path)) == os.path.abspath(directory):
-                    backups.append(backup_path)
-    except FileNotFoundError:
+        dir_stat = os.stat(directory)
+    except OSError:
+        return []
+    if not stat_module.S_ISDIR(dir_stat.st_mode):
         return []
 
-    return backups
+    stem, ext = os.path.splitext(filename)
+    match = _timestamped_re(stem, ext).match
+    # _scan_dir 只回傳該目錄下的一般檔案名：scandir 不會產生含分隔符的
+    # 名稱或 "."/".."，逐候選的 abspath 防衛檢查（每次兩個 syscall）可省
+    return [
+        os.path.join(directory, candidate)
+        for candidate in _scan_dir(directory, dir_stat.st_mtime_ns)
+        if match(candidate)
+    ]
 
 
 def cleanup_exports(filepath: str, include_canonical: bool = False) -> list[str]:
@@ -1,6 +1,9 @@
+import calendar
 import os
 import re
-from datetime import datetime, timedelta
+
+# 模組層級預編譯：re.match(str, ...) 每次都要走 re 內部快取的雜湊查找
+_FILENAME_RE = re.compile(r"(\d{6})(?:-(\d{6}))?-(.+?)-出勤資料\.txt$")
 
 
 def parse_range_and_user(filepath: str) -> tuple[str | None, str | None, str | None]:
@@ -12,8 +15,7 @@ def parse_range_and_user(filepath: str) -> tuple[str | None, str | None, str | N
         (user_name, start_date 'YYYY-MM-DD', end_date 'YYYY-MM-DD')
     """
     filename = os.path.basename(filepath)
-    pattern = r"(\d{6})(?:-(\d{6}))?-(.+?)-出勤資料\.txt$"
-    match = re.match(pattern, filename)
+    match = _FILENAME_RE.match(filename)
     if not match:
         return None, None, None
 
@@ -21,31 +23,19 @@ def parse_range_and_user(filepath: str) -> tuple[str | None, str | None, str | N
     end_month_str = match.group(2)
     user_name = match.group(3)
 
+    # 月初/月底以整數運算求得：不需為了格式化日期字串建 datetime 物件
     try:
         start_year = int(start_month_str[:4])
         start_month = int(start_month_str[4:6])
-        start_date = datetime(start_year, start_month, 1).strftime("%Y-%m-%d")
-    except ValueError:
-        return None, None, None
-
-    # end date
-    if end_month_str:
-        try:
+        if end_month_str:
             end_year = int(end_month_str[:4])
             end_month = int(end_month_str[4:6])
-            next_year = end_year + (1 if end_month == 12 else 0)
-            next_month_num = 1 if end_month == 12 else end_month + 1
-            next_month = datetime(next_year, next_month_num, 1)
-            end_date = (next_month - timedelta(days=1)).strftime("%Y-%m-%d")
-        except ValueError:
-            return None, None, None
-    else:
-        try:
-            next_year = start_year + (1 if start_month == 12 else 0)
-            next_month_num = 1 if start_month == 12 else start_month + 1
-            next_month = datetime(next_year, next_month_num, 1)
-            end_date = (next_month - timedelta(days=1)).strftime("%Y-%m-%d")
-        except ValueError:
-            return None, None, None
+        else:
+            end_year, end_month = start_year, start_month
+        last_day = calendar.monthrange(end_year, end_month)[1]
+    except ValueError:
+        return None, None, None
 
+    start_date = f"{start_year:04d}-{start_month:02d}-01"
+    end_date = f"{end_year:04d}-{end_month:02d}-{last_day:02d}"
     return user_name, start_date, end_date
@@ -3,24 +3,49 @@
 Designed to be dependency-light and avoid importing analyzer types.
 """
 
+import functools
 import re
 from datetime import datetime
 
+# 預編譯 + count=1：行首最多一個行號標記
+_LINE_NUM_RE = re.compile(r"^\s*\d+→")
+
 
 def clean_line(line: str) -> str:
     """Remove leading line-number markers like '  12→' if present."""
-    return re.sub(r"^\s*\d+→", "", line)
+    # 絕大多數行沒有標記：先用便宜的子字串檢查跳過 regex 引擎
+    if "→" not in line:
+        return line
+    return _LINE_NUM_RE.sub("", line, count=1)
+
+
+# 合法刷卡別（frozenset 成員測試，兼作常數語意）
+_VALID_TYPES = frozenset({"上班", "下班"})
 
 
 def split_fields(line: str, expected: int = 9) -> list[str]:
     """Split tab-separated fields and right-pad to the expected length."""
     parts = line.split("\t")
-    while len(parts) < expected:
-        parts.append("")
+    missing = expected - len(parts)
+    if missing > 0:
+        # 一次擴充取代逐一 append
+        parts += [""] * missing
     return parts
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_datetime_str(s: str) -> datetime | None:
+    """同一時間字串在整份檔案會重複出現（班表時間每天兩筆），快取後
+    重複字串只剩 dict 查找；None（格式錯誤）也會被快取，避免重複走
+    例外慢路徑。datetime 不可變，共用實例安全。"""
+    # 固定寬度 "%Y/%m/%d %H:%M" 直接切片轉 int：strptime 每次呼叫都要
+    # 走一遍格式 DSL，切片 + datetime() 建構快數倍；長度不符的字串
+    # （如未補零）退回 strptime 保持行為一致
+    if len(s) == 16 and s[4] == "/" and s[7] == "/" and s[10] == " " and s[13] == ":":
+        try:
+            return datetime(int(s[:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]))
+        except ValueError:
+            return None
     try:
         return datetime.strptime(s, "%Y/%m/%d %H:%M")
     except Exception:
@@ -37,26 +62,28 @@ def parse_line(
     """
     line = clean_line(line)
     fields = split_fields(line)
-    scheduled_str, actual_str, type_str = fields[0], fields[1], fields[2]
-    card_num, source, status = fields[3], fields[4], fields[5]
-    processed, operation, note = fields[6], fields[7], fields[8]
-
-    if not scheduled_str or type_str not in ("上班", "下班"):
+    # 先用便宜的欄位檢查把無效行擋掉，再進昂貴的日期解析
+    type_str = fields[2]
+    if type_str not in _VALID_TYPES:
+        return None
+    scheduled_str = fields[0]
+    if not scheduled_str:
         return None
 
-    scheduled_dt = parse_datetime_str(scheduled_str) if scheduled_str else None
-    actual_dt = parse_datetime_str(actual_str) if actual_str else None
+    scheduled_dt = parse_datetime_str(scheduled_str)
     if not scheduled_dt:
         return None
+    actual_str = fields[1]
+    actual_dt = parse_datetime_str(actual_str) if actual_str else None
 
     return (
         scheduled_dt,
         actual_dt,
         type_str,
-        card_num,
-        source,
-        status,
-        processed,
-        operation,
-        note,
+        fields[3],
+        fields[4],
+        fields[5],
+        fields[6],
+        fields[7],
+        fields[8],
     )
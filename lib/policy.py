@@ -1,10 +1,29 @@
+import functools
 import math
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
 
-@dataclass
+@functools.lru_cache(maxsize=64)
+def _hhmm(value: str) -> tuple[int, int]:
+    """解析 "HH:MM" 成 (時, 分)；規則字串固定不變，快取一次即可。"""
+    hour, minute = value.split(":")
+    return int(hour), int(minute)
+
+
+def _fmt_hm(dt: datetime) -> str:
+    """HH:MM 字串；f-string 格式化比 strftime 的格式 DSL 走訪便宜。"""
+    return f"{dt.hour:02d}:{dt.minute:02d}"
+
+
+def _at(day: datetime, hhmm: str) -> datetime:
+    """把當日 00:00 的 datetime 調成指定時分（免 strftime+strptime 往返）。"""
+    hour, minute = _hhmm(hhmm)
+    return day.replace(hour=hour, minute=minute)
+
+
+@dataclass(slots=True, frozen=True)
 class Rules:
     schedule_start: str = "09:30"  # 個人班表起始時間
     schedule_end: str = "18:30"  # 個人班表結束時間
@@ -42,21 +61,20 @@ def calculate_late_minutes(workday: Any, rules: Rules) -> tuple[int, str, str]:
     if not ch or not ch.actual_time:
         return 0, "", ""
 
-    date_str = workday.date.strftime("%Y/%m/%d")
-    latest_checkin = datetime.strptime(f"{date_str} {rules.latest_checkin}", "%Y/%m/%d %H:%M")
+    latest_checkin = _at(workday.date, rules.latest_checkin)
     actual_checkin = ch.actual_time
 
     if actual_checkin <= latest_checkin:
         return 0, "", ""
 
     # 遲到分鐘數 = 實際到班 - 班表起始時間
-    schedule_start = datetime.strptime(f"{date_str} {rules.schedule_start}", "%Y/%m/%d %H:%M")
+    schedule_start = _at(workday.date, rules.schedule_start)
     delta = actual_checkin - schedule_start
     late_minutes = int(delta.total_seconds() // 60)
 
-    time_range = f"{rules.schedule_start}~{actual_checkin.strftime('%H:%M')}"
+    time_range = f"{rules.schedule_start}~{_fmt_hm(actual_checkin)}"
     calculation = (
-        f"實際上班: {actual_checkin.strftime('%H:%M')}, "
+        f"實際上班: {_fmt_hm(actual_checkin)}, "
         f"班表起始: {rules.schedule_start}, "
         f"需請假: {late_minutes}分鐘"
     )
@@ -83,10 +101,9 @@ def calculate_leave_suggestion(
 
     ch = workday.checkin_record
     actual_checkin = ch.actual_time
-    date_str = workday.date.strftime("%Y/%m/%d")
-    schedule_start = datetime.strptime(f"{date_str} {rules.schedule_start}", "%Y/%m/%d %H:%M")
-    lunch_start = datetime.strptime(f"{date_str} {rules.lunch_start}", "%Y/%m/%d %H:%M")
-    lunch_end = datetime.strptime(f"{date_str} {rules.lunch_end}", "%Y/%m/%d %H:%M")
+    schedule_start = _at(workday.date, rules.schedule_start)
+    lunch_start = _at(workday.date, rules.lunch_start)
+    lunch_end = _at(workday.date, rules.lunch_end)
 
     # 扣除遲到區間 [班表起始, 實際到班] 與午休 [lunch_start, lunch_end] 的重疊
     overlap_start = max(schedule_start, lunch_start)
@@ -106,8 +123,8 @@ def calculate_leave_suggestion(
         leave_end = naive_end
 
     return (
-        schedule_start.strftime("%H:%M"),
-        leave_end.strftime("%H:%M"),
+        _fmt_hm(schedule_start),
+        _fmt_hm(leave_end),
         leave_hours,
         effective_minutes,
     )
@@ -127,15 +144,14 @@ def calculate_expected_checkout(workday: Any, rules: Rules, work_start_time: dat
     Returns:
         預期下班時間
     """
-    date_str = workday.date.strftime("%Y/%m/%d")
-    latest_checkin = datetime.strptime(f"{date_str} {rules.latest_checkin}", "%Y/%m/%d %H:%M")
+    latest_checkin = _at(workday.date, rules.latest_checkin)
 
     ch = workday.checkin_record
     actual_checkin = ch.actual_time if ch and ch.actual_time else work_start_time
 
     if actual_checkin > latest_checkin:
         # 遲到：預期下班 = 班表結束時間
-        return datetime.strptime(f"{date_str} {rules.schedule_end}", "%Y/%m/%d %H:%M")
+        return _at(workday.date, rules.schedule_end)
 
     # 正常：預期下班 = 實際到班 + 9小時
     total_hours = rules.work_hours + rules.lunch_hours
@@ -162,9 +178,7 @@ def optimize_forget_punch(
     ch = workday.checkin_record
     actual_checkin = ch.actual_time
 
-    latest_checkin = datetime.strptime(
-        f"{workday.date.strftime('%Y/%m/%d')} {rules.latest_checkin}", "%Y/%m/%d %H:%M"
-    )
+    latest_checkin = _at(workday.date, rules.latest_checkin)
 
     # 預設忘刷卡時段：10:30 ~ 實際上班
     default_start = latest_checkin
@@ -175,7 +189,7 @@ def optimize_forget_punch(
 
     # 如果沒有早退，使用預設時段
     if actual_checkout >= expected_checkout_default:
-        return default_start.strftime("%H:%M"), forget_end.strftime("%H:%M")
+        return _fmt_hm(default_start), _fmt_hm(forget_end)
 
     # 有早退，嘗試優化
     early_leave_minutes = int((expected_checkout_default - actual_checkout).total_seconds() // 60)
@@ -187,10 +201,10 @@ def optimize_forget_punch(
     # 如果調整量在合理範圍內（不超過遲到時間），則應用優化
     if 0 < optimal_adjustment <= late_minutes:
         optimized_start = latest_checkin - timedelta(minutes=optimal_adjustment)
-        return optimized_start.strftime("%H:%M"), forget_end.strftime("%H:%M")
+        return _fmt_hm(optimized_start), _fmt_hm(forget_end)
 
     # 否則使用預設時段
-    return default_start.strftime("%H:%M"), forget_end.strftime("%H:%M")
+    return _fmt_hm(default_start), _fmt_hm(forget_end)
 
 
 def calculate_early_leave(
@@ -214,10 +228,10 @@ def calculate_early_leave(
     early_leave_minutes = int(delta.total_seconds() // 60)
     early_leave_hours = math.ceil(early_leave_minutes / 60)
 
-    time_range = f"{actual_checkout.strftime('%H:%M')}~{expected_checkout.strftime('%H:%M')}"
+    time_range = f"{_fmt_hm(actual_checkout)}~{_fmt_hm(expected_checkout)}"
     calculation = (
-        f"實際下班: {actual_checkout.strftime('%H:%M')}, "
-        f"預期下班: {expected_checkout.strftime('%H:%M')}, "
+        f"實際下班: {_fmt_hm(actual_checkout)}, "
+        f"預期下班: {_fmt_hm(expected_checkout)}, "
         f"早退: {early_leave_minutes}分鐘（建議請 {early_leave_hours} 小時）"
     )
 
@@ -252,10 +266,10 @@ def calculate_overtime_minutes(
     applicable_minutes = applicable_hours * rules.overtime_increment_minutes
 
     # 時段顯示完整實際加班時間
-    time_range = f"{expected_checkout.strftime('%H:%M')}~{actual_checkout.strftime('%H:%M')}"
+    time_range = f"{_fmt_hm(expected_checkout)}~{_fmt_hm(actual_checkout)}"
     calculation = (
-        f"預期下班: {expected_checkout.strftime('%H:%M')}, "
-        f"實際下班: {actual_checkout.strftime('%H:%M')}, "
+        f"預期下班: {_fmt_hm(expected_checkout)}, "
+        f"實際下班: {_fmt_hm(actual_checkout)}, "
         f"實際加班: {actual_overtime_minutes}分鐘, 可申請: {applicable_minutes}分鐘"
     )
 
@@ -0,0 +1,59 @@
+"""Single-pass traversal fusing the per-record helpers.
+
+`lib.dates.years_from_records`、`lib.dates.identify_complete_work_days`
+與 `lib.grouping.group_daily` 各自完整走訪一次 records，而 analyzer 在
+同一次執行裡三者都會用到。這裡把三個走訪融合成一個迴圈：少兩次完整
+走訪與每筆記錄的重複屬性存取。原模組的薄包裝仍保留，供只需要單一
+結果的呼叫端使用。
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from lib.dates import _get_date_type, checkin_member
+
+
+def analyze_records(records: Iterable) -> tuple[set[int], list[datetime], dict]:
+    """Walk records once; return (years, complete_days, daily).
+
+    daily 形狀與 `lib.grouping.group_daily` 相同：date -> [checkin,
+    checkout]；complete_days 為同時有上下班紀錄的日期（00:00 的
+    datetime，已排序），與 `identify_complete_work_days` 一致。
+    """
+    years: set[int] = set()
+    years_add = years.add
+    daily: dict = {}
+    daily_get = daily.get
+    checkin = checkin_member()
+    for rec in records:
+        try:
+            d, t = _get_date_type(rec)
+        except AttributeError:
+            continue
+        if not d:
+            continue
+        years_add(d.year)
+        slot = daily_get(d)
+        if slot is None:
+            slot = daily[d] = [None, None]
+        if t is checkin:
+            slot[0] = rec
+            continue
+        # support Enum with .name or direct string
+        name = getattr(t, "name", None) or str(t)
+        if name == "CHECKIN":
+            slot[0] = rec
+        else:
+            slot[1] = rec
+
+    return years, complete_days_from_daily(daily), daily
+
+
+def complete_days_from_daily(daily: dict) -> list[datetime]:
+    """從 date -> [checkin, checkout] 分組萃取完整工作日（已排序）。"""
+    midnight = datetime.min.time()
+    return sorted(
+        datetime.combine(d, midnight)
+        for d, slot in daily.items()
+        if slot[0] is not None and slot[1] is not None
+    )
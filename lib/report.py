@@ -9,12 +9,14 @@ from collections.abc import Iterable
 def build_incremental_lines(
     user: str, total_complete: int, unprocessed_count: int, unprocessed_dates: list[str]
 ) -> list[str]:
-    lines: list[str] = []
-    lines.append("## 📈 增量分析資訊：\n")
-    lines.append(f"- 👤 使用者：{user}")
-    lines.append(f"- 📊 總完整工作日：{total_complete} 天")
-    lines.append(f"- 🔄 新處理工作日：{unprocessed_count} 天")
-    lines.append(f"- ⏭️  跳過已處理：{total_complete - unprocessed_count} 天")
+    # 固定行一次以 list 字面值建好（單一 BUILD_LIST，免去逐行 append 呼叫）
+    lines = [
+        "## 📈 增量分析資訊：\n",
+        f"- 👤 使用者：{user}",
+        f"- 📊 總完整工作日：{total_complete} 天",
+        f"- 🔄 新處理工作日：{unprocessed_count} 天",
+        f"- ⏭️  跳過已處理：{total_complete - unprocessed_count} 天",
+    ]
     if unprocessed_dates:
         preview = ", ".join(unprocessed_dates[:5])
         if len(unprocessed_dates) > 5:
@@ -31,15 +33,21 @@ def build_issue_section(
     if not issues:
         return lines
     lines.append(f"{title}\n")
+    # 熱迴圈：time_range/calculation 是 Issue 的宣告欄位（預設空字串），
+    # 直接屬性存取比帶預設值的 getattr 便宜；date_str 已在 __post_init__
+    # 預先格式化，僅對未提供的鴨子型別退回 strftime
+    append = lines.append
     for i, issue in enumerate(issues, 1):
-        lines.append(
-            f"{i}. **{issue.date.strftime('%Y/%m/%d')}** - {prefix_icon} {issue.description}"
-        )
-        if getattr(issue, "time_range", ""):
-            lines.append(f"   ⏰ 時段: {issue.time_range}")
-        if show_calc and getattr(issue, "calculation", ""):
-            lines.append(f"   🧮 計算: {issue.calculation}")
-        lines.append("")
+        date_str = getattr(issue, "date_str", "") or issue.date.strftime("%Y/%m/%d")
+        append(f"{i}. **{date_str}** - {prefix_icon} {issue.description}")
+        time_range = issue.time_range
+        if time_range:
+            append(f"   ⏰ 時段: {time_range}")
+        if show_calc:
+            calculation = issue.calculation
+            if calculation:
+                append(f"   🧮 計算: {calculation}")
+        append("")
     return lines
 
 
@@ -1,8 +1,27 @@
+import functools
 import json
 import logging
 import os
 from collections.abc import Iterable
-from datetime import datetime
+from datetime import date, datetime
+
+# 狀態檔讀寫優先走 orjson（C 實作，快 5-10 倍）；未安裝則退回 stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date(s: str) -> date:
+    """快取 YYYY-MM-DD 解析：同一批範圍比對會重複解析相同字串。
+
+    固定寬度格式直接切片轉 int；格式不符退回 strptime（錯誤同樣拋
+    ValueError，呼叫端行為不變）。"""
+    if len(s) == 10 and s[4] == "-" and s[7] == "-":
+        return date(int(s[:4]), int(s[5:7]), int(s[8:10]))
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
 
 logger = logging.getLogger(__name__)
 
@@ -19,14 +38,20 @@ class AttendanceStateManager:
         self.read_only = read_only
         if self.read_only:
             logger.debug("🛡️  狀態管理器以唯讀模式載入：%s", self.state_file)
+        # 上次落盤的序列化內容：save_state 據此略過無變更的重寫
+        self._last_saved_payload: bytes | None = None
         self.state_data = self._load_state()
 
     def _load_state(self) -> dict:
         if os.path.exists(self.state_file):
             try:
-                with open(self.state_file, encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError) as e:
+                # 整檔一次讀入再解析：單一 read syscall，兩種後端皆然
+                with open(self.state_file, "rb") as f:
+                    raw = f.read()
+                state = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                self._last_saved_payload = raw
+                return state
+            except (ValueError, OSError) as e:
                 logger.warning("無法讀取狀態檔案 %s: %s", self.state_file, e)
                 logger.warning("將使用空白狀態")
         return {"users": {}}
@@ -36,25 +61,43 @@ class AttendanceStateManager:
             logger.debug("🛡️  Debug/唯讀模式：略過狀態寫入 %s", self.state_file)
             return
         try:
-            with open(self.state_file, "w", encoding="utf-8") as f:
-                json.dump(self.state_data, f, ensure_ascii=False, indent=2)
+            # 先在記憶體完成序列化再單次寫出：json.dump 逐段寫檔會產生
+            # 大量小 write，整包 bytes 一次 write 即可
+            if orjson is not None:
+                payload = orjson.dumps(self.state_data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(self.state_data, ensure_ascii=False, indent=2).encode("utf-8")
+            # 內容與上次落盤相同就不重寫（重複分析未變更狀態時省一次磁碟寫入）
+            if payload == self._last_saved_payload:
+                logger.debug("狀態無變更，略過寫入 %s", self.state_file)
+                return
+            # 先寫暫存檔再 os.replace：寫到一半中斷不會留下壞掉的狀態檔
+            tmp_path = f"{self.state_file}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.state_file)
+            self._last_saved_payload = payload
         except OSError as e:
             logger.warning("無法儲存狀態檔案 %s: %s", self.state_file, e)
 
     def get_user_processed_ranges(self, user_name: str) -> list[dict]:
-        if user_name not in self.state_data["users"]:
+        # 單次 .get 取代「in 檢查 + 索引」的兩次雜湊查找
+        user_data = self.state_data["users"].get(user_name)
+        if user_data is None:
             return []
-        return self.state_data["users"][user_name].get("processed_date_ranges", [])
+        return user_data.get("processed_date_ranges", [])
 
     def get_forget_punch_usage(self, user_name: str, year_month: str) -> int:
-        if user_name not in self.state_data["users"]:
+        user_data = self.state_data["users"].get(user_name)
+        if user_data is None:
             return 0
-        return self.state_data["users"][user_name].get("forget_punch_usage", {}).get(year_month, 0)
+        return user_data.get("forget_punch_usage", {}).get(year_month, 0)
 
     def get_last_analysis_time(self, user_name: str) -> str:
-        if user_name not in self.state_data.get("users", {}):
+        user_data = self.state_data.get("users", {}).get(user_name)
+        if user_data is None:
             return ""
-        ranges = self.state_data["users"][user_name].get("processed_date_ranges", [])
+        ranges = user_data.get("processed_date_ranges", [])
         return max((r.get("last_analysis_time", "") for r in ranges), default="")
 
     def update_user_state(
@@ -63,12 +106,10 @@ class AttendanceStateManager:
         new_range: dict[str, str],
         forget_punch_usage: dict[str, int] = None,
     ) -> None:
-        if user_name not in self.state_data["users"]:
-            self.state_data["users"][user_name] = {
-                "processed_date_ranges": [],
-                "forget_punch_usage": {},
-            }
-        user_data = self.state_data["users"][user_name]
+        user_data = self.state_data["users"].setdefault(
+            user_name,
+            {"processed_date_ranges": [], "forget_punch_usage": {}},
+        )
         existing_ranges = user_data["processed_date_ranges"]
         updated = False
         for i, existing_range in enumerate(existing_ranges):
@@ -122,12 +163,10 @@ class AttendanceStateManager:
         """Replace the user's mirrored applied-form lists with fresh data.
 
         Each entry is augmented with `synced_at` if it isn't already set."""
-        if user_name not in self.state_data["users"]:
-            self.state_data["users"][user_name] = {
-                "processed_date_ranges": [],
-                "forget_punch_usage": {},
-            }
-        user = self.state_data["users"][user_name]
+        user = self.state_data["users"].setdefault(
+            user_name,
+            {"processed_date_ranges": [], "forget_punch_usage": {}},
+        )
         applied = user.setdefault("applied_forms", {})
         for kind, entries in entries_by_kind.items():
             cleaned = []
@@ -140,12 +179,10 @@ class AttendanceStateManager:
 
     def record_applied_form(self, user_name: str, kind: str, entry: dict, recorded_at: str) -> None:
         """Record a locally submitted form without changing last_full_sync."""
-        if user_name not in self.state_data["users"]:
-            self.state_data["users"][user_name] = {
-                "processed_date_ranges": [],
-                "forget_punch_usage": {},
-            }
-        user = self.state_data["users"][user_name]
+        user = self.state_data["users"].setdefault(
+            user_name,
+            {"processed_date_ranges": [], "forget_punch_usage": {}},
+        )
         applied = user.setdefault("applied_forms", {})
         entries = applied.setdefault(kind, [])
         rec = dict(entry)
@@ -179,11 +216,11 @@ class AttendanceStateManager:
     ) -> list[tuple[str, str]]:
         overlaps = []
         existing_ranges = self.get_user_processed_ranges(user_name)
-        new_start = datetime.strptime(new_start_date, "%Y-%m-%d").date()
-        new_end = datetime.strptime(new_end_date, "%Y-%m-%d").date()
+        new_start = _parse_date(new_start_date)
+        new_end = _parse_date(new_end_date)
         for range_info in existing_ranges:
-            existing_start = datetime.strptime(range_info["start_date"], "%Y-%m-%d").date()
-            existing_end = datetime.strptime(range_info["end_date"], "%Y-%m-%d").date()
+            existing_start = _parse_date(range_info["start_date"])
+            existing_end = _parse_date(range_info["end_date"])
             if new_start <= existing_end and new_end >= existing_start:
                 overlap_start = max(new_start, existing_start)
                 overlap_end = min(new_end, existing_end)
@@ -209,8 +246,8 @@ def filter_unprocessed_dates(
     norm_ranges: list[tuple[datetime, datetime]] = []
     for r in processed_ranges or []:
         try:
-            s = datetime.strptime(r["start_date"], "%Y-%m-%d").date()
-            e = datetime.strptime(r["end_date"], "%Y-%m-%d").date()
+            s = _parse_date(r["start_date"])
+            e = _parse_date(r["end_date"])
             norm_ranges.append((s, e))
         except Exception:
             # skip malformed range
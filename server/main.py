@@ -18,6 +18,15 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
+# JSON 熱路徑（API 回應序列化、清理快照 token）優先走 orjson；
+# 未安裝則退回 stdlib json 與 FastAPI 預設回應類別
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _DefaultResponseClass
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+    from fastapi.responses import JSONResponse as _DefaultResponseClass
+
 from attendance_analyzer import AttendanceAnalyzer, IssueType, logger as analyzer_logger
 from lib.export_cleanup import cleanup_exports as cleanup_exports_helper, list_backups
 from lib.filename import parse_range_and_user
@@ -41,6 +50,18 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(OUTPUT_ROOT, exist_ok=True)
 CANONICAL_OUTPUT_DIR = os.path.join(OUTPUT_ROOT, "canonical")
 os.makedirs(CANONICAL_OUTPUT_DIR, exist_ok=True)
+# 下載路徑檢查用的已解析根目錄：模組載入解析一次，不必每請求 resolve
+_OUTPUT_ROOT_RESOLVED = Path(OUTPUT_ROOT).resolve()
+
+# analyze 的分析→匯出→狀態寫入區段共用 attendance_state.json 與 canonical
+# 匯出路徑，須在程序內序列化（分析管線已移往 worker thread，不再由事件
+# 迴圈天然排他）
+_ANALYZE_LOCK = asyncio.Lock()
+
+# Contain network backoff for holiday API when network is restricted.
+# 匯入時設定一次即可，不必在每個 analyze 請求重跑 setdefault
+os.environ.setdefault("HOLIDAY_API_MAX_RETRIES", "0")
+os.environ.setdefault("HOLIDAY_API_BACKOFF_BASE", "0.1")
 
 
 class IssueDTO(BaseModel):
@@ -107,43 +128,66 @@ def _save_upload(upload: UploadFile, session_dir: str) -> str:
     base_name = base_name.replace("/", "_").replace("\\", "_")
     upload_path = os.path.join(session_dir, base_name)
     with open(upload_path, "wb") as f:
-        shutil.copyfileobj(upload.file, f)
+        # 1 MiB 緩衝：預設 64 KiB 對大檔會多出數十倍的小 read/write 往返
+        shutil.copyfileobj(upload.file, f, length=1 << 20)
     return upload_path
 
 
-def _issues_to_dtos(analyzer: AttendanceAnalyzer, limit: int = 50) -> list[IssueDTO]:
+# 統計鍵直接以 enum 成員為 key：單迴圈累加，免建 Counter、免逐鍵 .value 取值
+_TOTAL_KEYS = {
+    IssueType.FORGET_PUNCH: "FORGET_PUNCH",
+    IssueType.LATE: "LATE",
+    IssueType.OVERTIME: "OVERTIME",
+    IssueType.WFH: "WFH",
+    IssueType.WEEKDAY_LEAVE: "WEEKDAY_LEAVE",
+}
+
+
+def _run_analysis(upload_path: str, incremental: bool, debug_mode: bool) -> AttendanceAnalyzer:
+    """同步的解析→分組→分析管線；analyze 端點以 to_thread 呼叫。"""
+    analyzer = AttendanceAnalyzer(debug=debug_mode)
+    analyzer.parse_attendance_file(upload_path, incremental=incremental)
+    analyzer.group_records_by_day()
+    analyzer.analyze_attendance()
+    return analyzer
+
+
+def _issues_and_totals(
+    analyzer: AttendanceAnalyzer, limit: int = 50
+) -> tuple[list[IssueDTO], dict]:
+    """單一走訪同時累計統計並組前 limit 筆預覽 DTO（免走兩次 issues）。
+
+    熱迴圈：date_str 由 Issue.__post_init__ 預先格式化（免逐筆 strftime）；
+    time_range/calculation/is_new 為宣告欄位，直接屬性存取；狀態字串與
+    incremental 判斷提到迴圈外。
+    """
+    incremental = analyzer.incremental_mode
+    totals = dict.fromkeys(_TOTAL_KEYS.values(), 0)
+    get_key = _TOTAL_KEYS.get
     items: list[IssueDTO] = []
-    for issue in analyzer.issues[:limit]:
-        items.append(
-            IssueDTO(
-                date=issue.date.strftime("%Y/%m/%d"),
-                type=issue.type.value,
-                duration_minutes=issue.duration_minutes,
-                description=issue.description,
-                time_range=getattr(issue, "time_range", ""),
-                calculation=getattr(issue, "calculation", ""),
-                status=(
-                    ("[NEW] 本次新發現" if getattr(issue, "is_new", False) else "已存在")
-                    if analyzer.incremental_mode
-                    else None
-                ),
+    append = items.append
+    for issue in analyzer.issues:
+        key = get_key(issue.type)
+        if key:
+            totals[key] += 1
+        if len(items) < limit:
+            if incremental:
+                status = "[NEW] 本次新發現" if issue.is_new else "已存在"
+            else:
+                status = None
+            append(
+                IssueDTO(
+                    date=issue.date_str,
+                    type=issue.type.value,
+                    duration_minutes=issue.duration_minutes,
+                    description=issue.description,
+                    time_range=issue.time_range,
+                    calculation=issue.calculation,
+                    status=status,
+                )
             )
-        )
-    return items
-
-
-def _totals(analyzer: AttendanceAnalyzer) -> dict:
-    from collections import Counter
-
-    c = Counter([i.type.value for i in analyzer.issues])
-    return {
-        "FORGET_PUNCH": c.get(IssueType.FORGET_PUNCH.value, 0),
-        "LATE": c.get(IssueType.LATE.value, 0),
-        "OVERTIME": c.get(IssueType.OVERTIME.value, 0),
-        "WFH": c.get(IssueType.WFH.value, 0),
-        "WEEKDAY_LEAVE": c.get(IssueType.WEEKDAY_LEAVE.value, 0),
-        "TOTAL": len(analyzer.issues),
-    }
+    totals["TOTAL"] = len(analyzer.issues)
+    return items, totals
 
 
 logger = logging.getLogger("fhr.service")
@@ -162,33 +206,46 @@ def _canonical_output_path(filename: str | None, output: Literal["csv", "excel"]
     ext = ".xlsx" if output == "excel" else ".csv"
     preferred = os.path.join(CANONICAL_OUTPUT_DIR, f"{stem}_analysis{ext}")
     if output == "excel" and not os.path.exists(preferred):
-        fallback = preferred.replace(".xlsx", ".csv")
+        fallback = os.path.splitext(preferred)[0] + ".csv"
         if os.path.exists(fallback):
             return fallback
     return preferred
 
 
 def _list_backups_info(canonical_path: str) -> list[dict]:
+    backups = list_backups(canonical_path)
+    if not backups:
+        return []
+    # 一次 scandir 取回整個目錄的 DirEntry（自帶快取的 stat），
+    # 取代逐一 os.stat 的 N 次 syscall
+    directory = os.path.dirname(backups[0]) or "."
+    try:
+        with os.scandir(directory) as entries:
+            entries_by_name = {entry.name: entry for entry in entries}
+    except OSError:
+        entries_by_name = {}
     items = []
-    for candidate in list_backups(canonical_path):
+    for candidate in backups:
+        entry = entries_by_name.get(os.path.basename(candidate))
+        if entry is None:
+            continue
         try:
-            stat = os.stat(candidate)
-            items.append(
-                {
-                    "name": os.path.basename(candidate),
-                    "size": stat.st_size,
-                    "mtime": stat.st_mtime,
-                }
-            )
+            stat = entry.stat()
         except FileNotFoundError:
             continue
+        items.append(
+            {
+                "name": entry.name,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+            }
+        )
     items.sort(key=lambda x: x["name"])
     return items
 
 
 def _canonical_snapshot(canonical_path: str) -> dict | None:
-    if not os.path.exists(canonical_path):
-        return None
+    # 單一 stat 即可：不存在走 FileNotFoundError，免去 exists 的前置 syscall
     try:
         stat = os.stat(canonical_path)
     except FileNotFoundError:
@@ -214,8 +271,11 @@ def _build_snapshot_payload(
 
 
 def _snapshot_token(snapshot: dict) -> str:
-    serialized = json.dumps(snapshot, sort_keys=True, separators=(",", ":"))
-    return sha256(serialized.encode("utf-8")).hexdigest()
+    if orjson is not None:
+        serialized = orjson.dumps(snapshot, option=orjson.OPT_SORT_KEYS)
+    else:
+        serialized = json.dumps(snapshot, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return sha256(serialized).hexdigest()
 
 
 def _build_preview_response(
@@ -265,13 +325,12 @@ def _snapshots_strict_equal(expected: dict, current: dict) -> bool:
         return False
     if expected.get("export_policy") != current.get("export_policy"):
         return False
-    exp_map = _backups_to_map(expected)
-    cur_map = _backups_to_map(current)
-    if exp_map != cur_map:
+    # 便宜的判別先行：數量或 canonical 有無不同就不用建 map 細比
+    if len(expected.get("backups", ())) != len(current.get("backups", ())):
+        return False
+    if bool(expected.get("canonical")) != bool(current.get("canonical")):
         return False
-    exp_canonical = expected.get("canonical")
-    cur_canonical = current.get("canonical")
-    return bool(exp_canonical) == bool(cur_canonical)
+    return _backups_to_map(expected) == _backups_to_map(current)
 
 
 def _snapshots_cleanup_compatible(
@@ -284,12 +343,17 @@ def _snapshots_cleanup_compatible(
     if preview_snapshot.get("export_policy") != current_snapshot.get("export_policy"):
         return False
 
+    # merge 模式要求完全一致：長度不同可直接否決，省掉建 map 的成本
+    if export_policy != "archive":
+        exp_backups = preview_snapshot.get("backups", ())
+        cur_backups = current_snapshot.get("backups", ())
+        if len(exp_backups) != len(cur_backups):
+            return False
+        return _backups_to_map(preview_snapshot) == _backups_to_map(current_snapshot)
+
     exp_map = _backups_to_map(preview_snapshot)
     cur_map = _backups_to_map(current_snapshot)
 
-    if export_policy != "archive":
-        return exp_map == cur_map
-
     # Archive: allowance for one new backup generated from canonical rename
     if cur_map == exp_map:
         return True
@@ -316,11 +380,15 @@ def _snapshots_cleanup_compatible(
     return True
 
 
+# 真值字面值集合：模組常數，免得每次呼叫都重建 set
+_TRUTHY_VALUES = frozenset({"1", "true", "yes", "on"})
+
+
 def _env_flag(name: str, default: bool = False) -> bool:
     value = os.getenv(name)
     if value is None:
         return default
-    return value.strip().lower() in {"1", "true", "yes", "on"}
+    return value.strip().lower() in _TRUTHY_VALUES
 
 
 GLOBAL_DEBUG_MODE = _env_flag("FHR_DEBUG", False)
@@ -348,6 +416,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         description="Attendance analyzer web service",
         lifespan=_lifespan,
+        default_response_class=_DefaultResponseClass,
     )
 
     # Allow local dev tools by default
@@ -388,10 +457,6 @@ def create_app() -> FastAPI:
         cleanup_token: str | None = Form(None),
         cleanup_snapshot: str | None = Form(None),
     ):
-        # Contain network backoff for holiday API when network is restricted
-        os.environ.setdefault("HOLIDAY_API_MAX_RETRIES", "0")
-        os.environ.setdefault("HOLIDAY_API_BACKOFF_BASE", "0.1")
-
         debug_mode = GLOBAL_DEBUG_MODE or debug
         prev_logger_level = logger.level
         prev_analyzer_level = analyzer_logger.level
@@ -403,7 +468,8 @@ def create_app() -> FastAPI:
         session_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S") + "_" + uuid.uuid4().hex[:8]
         session_dir = os.path.join(UPLOAD_DIR, session_id)
         os.makedirs(session_dir, exist_ok=True)
-        upload_path = _save_upload(file, session_dir)
+        # 檔案落盤走 worker thread：同步 read/write 不佔住事件迴圈
+        upload_path = await asyncio.to_thread(_save_upload, file, session_dir)
 
         cleanup_result: dict | None = None
         cleanup_exports = bool(cleanup_exports)
@@ -415,8 +481,11 @@ def create_app() -> FastAPI:
             if not cleanup_token or not cleanup_snapshot:
                 raise HTTPException(status_code=400, detail="cleanup_preview_required")
             try:
-                provided_snapshot = json.loads(cleanup_snapshot)
-            except json.JSONDecodeError as exc:  # pragma: no cover - malformed client input
+                if orjson is not None:
+                    provided_snapshot = orjson.loads(cleanup_snapshot)
+                else:
+                    provided_snapshot = json.loads(cleanup_snapshot)
+            except ValueError as exc:  # pragma: no cover - malformed client input
                 raise HTTPException(status_code=400, detail="invalid_cleanup_snapshot") from exc
 
             if _snapshot_token(provided_snapshot) != cleanup_token:
@@ -446,110 +515,112 @@ def create_app() -> FastAPI:
                 )
 
         try:
-            # Optional reset of user state and detect first-time user
-            user_name, _, _ = parse_range_and_user(upload_path)
-            reset_applied = False
-            sm = AttendanceStateManager(read_only=debug_mode)
-            if reset_state and user_name:
-                if debug_mode:
-                    logger.debug("🛡️  Debug 模式：略過清除使用者 %s 的狀態", user_name)
-                elif user_name in sm.state_data.get("users", {}):
-                    del sm.state_data["users"][user_name]
-                    sm.save_state()
-                    reset_applied = True
-
-            # Determine if first-time user (post-reset state)
-            first_time_user = False
-            if user_name:
-                ranges = sm.get_user_processed_ranges(user_name)
-                first_time_user = not ranges
-
-            requested_mode = mode
-            # If first-time user is recognized, we still run analyzer in incremental mode
-            # to persist state (ranges empty -> analyze all days),
-            # but expose effective mode as 'full' in the response.
-            incremental = (mode == "incremental") or first_time_user
-            analyzer = AttendanceAnalyzer(debug=debug_mode)
-            analyzer.parse_attendance_file(upload_path, incremental=incremental)
-            analyzer.group_records_by_day()
-            analyzer.analyze_attendance()
-
-            # Prepare output placement
-            out_session = os.path.join(OUTPUT_ROOT, session_id)
-            os.makedirs(out_session, exist_ok=True)
-            base = os.path.basename(upload_path)
-            ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            stem = base[:-4] if base.lower().endswith(".txt") else base
-            backup_path = None
-
-            if output == "csv":
-                backup_path = analyzer.export_report(
-                    canonical_path, "csv", export_policy=export_policy
-                )
-                actual_format: Literal["csv", "excel"] = "csv"
-                canonical_output_path = canonical_path
-            else:
-                backup_path = analyzer.export_report(
-                    canonical_path, "excel", export_policy=export_policy
+            # 狀態檔與 canonical 匯出檔是跨請求共享的 read-modify-write
+            # 資源：以程序級 async lock 序列化「分析→匯出→狀態寫入」，
+            # 避免併發請求互相蓋寫 processed ranges；鎖不佔事件迴圈
+            async with _ANALYZE_LOCK:
+                # Optional reset of user state and detect first-time user
+                user_name, _, _ = parse_range_and_user(upload_path)
+                reset_applied = False
+                sm = AttendanceStateManager(read_only=debug_mode)
+                if reset_state and user_name:
+                    if debug_mode:
+                        logger.debug("🛡️  Debug 模式：略過清除使用者 %s 的狀態", user_name)
+                    elif user_name in sm.state_data.get("users", {}):
+                        del sm.state_data["users"][user_name]
+                        sm.save_state()
+                        reset_applied = True
+
+                # Determine if first-time user (post-reset state)
+                first_time_user = False
+                if user_name:
+                    ranges = sm.get_user_processed_ranges(user_name)
+                    first_time_user = not ranges
+
+                requested_mode = mode
+                # If first-time user is recognized, we still run analyzer in incremental mode
+                # to persist state (ranges empty -> analyze all days),
+                # but expose effective mode as 'full' in the response.
+                incremental = (mode == "incremental") or first_time_user
+                # CPU 密集的解析→分析管線丟進 worker thread，事件迴圈維持可回應
+                analyzer = await asyncio.to_thread(
+                    _run_analysis, upload_path, incremental, debug_mode
                 )
-                canonical_output_path = canonical_path
-                if not os.path.exists(canonical_output_path):
-                    csv_fallback = canonical_output_path.replace(".xlsx", ".csv")
-                    if os.path.exists(csv_fallback):
-                        canonical_output_path = csv_fallback
-                        canonical_requested_output = "csv"
-                        actual_format = "csv"
+
+                # Prepare output placement
+                out_session = os.path.join(OUTPUT_ROOT, session_id)
+                os.makedirs(out_session, exist_ok=True)
+                base = os.path.basename(upload_path)
+                ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+                stem = base[:-4] if base.lower().endswith(".txt") else base
+                backup_path = None
+
+                if output == "csv":
+                    backup_path = await asyncio.to_thread(
+                        analyzer.export_report, canonical_path, "csv", export_policy=export_policy
+                    )
+                    actual_format: Literal["csv", "excel"] = "csv"
+                    canonical_output_path = canonical_path
+                else:
+                    backup_path = await asyncio.to_thread(
+                        analyzer.export_report, canonical_path, "excel", export_policy=export_policy
+                    )
+                    canonical_output_path = canonical_path
+                    if not os.path.exists(canonical_output_path):
+                        csv_fallback = os.path.splitext(canonical_output_path)[0] + ".csv"
+                        if os.path.exists(csv_fallback):
+                            canonical_output_path = csv_fallback
+                            canonical_requested_output = "csv"
+                            actual_format = "csv"
+                        else:
+                            raise HTTPException(
+                                status_code=500, detail="Failed to generate output file"
+                            )
                     else:
-                        raise HTTPException(
-                            status_code=500, detail="Failed to generate output file"
+                        actual_format = "excel"
+
+                ext = os.path.splitext(canonical_output_path)[1]
+                out_filename = f"{stem}_analysis_{ts}{ext}"
+                out_path = os.path.join(out_session, out_filename)
+                shutil.copy2(canonical_output_path, out_path)
+
+                if cleanup_exports and provided_snapshot is not None:
+                    current_snapshot = _build_snapshot_payload(
+                        canonical_output_path, debug_mode, export_policy
+                    )
+                    if not _snapshots_cleanup_compatible(
+                        provided_snapshot, current_snapshot, export_policy
+                    ):
+                        cleanup_result = {
+                            "status": "stale",
+                            "deleted": [],
+                            "preview": _build_preview_response(
+                                file.filename,
+                                canonical_requested_output,
+                                debug_mode,
+                                export_policy,
+                            ).dict(),
+                        }
+                    else:
+                        removed = cleanup_exports_helper(
+                            canonical_output_path, include_canonical=debug_mode
                         )
-                else:
-                    actual_format = "excel"
-
-            out_session = os.path.join(OUTPUT_ROOT, session_id)
-            os.makedirs(out_session, exist_ok=True)
-            ext = os.path.splitext(canonical_output_path)[1]
-            out_filename = f"{stem}_analysis_{ts}{ext}"
-            out_path = os.path.join(out_session, out_filename)
-            shutil.copy2(canonical_output_path, out_path)
-
-            if cleanup_exports and provided_snapshot is not None:
-                current_snapshot = _build_snapshot_payload(
-                    canonical_output_path, debug_mode, export_policy
-                )
-                if not _snapshots_cleanup_compatible(
-                    provided_snapshot, current_snapshot, export_policy
-                ):
+                        # Ensure the freshly created backup (if any) is removed as well
+                        if backup_path and os.path.exists(backup_path):
+                            try:
+                                os.remove(backup_path)
+                                removed.append(backup_path)
+                            except FileNotFoundError:
+                                pass
+                        cleanup_result = {
+                            "status": "performed",
+                            "deleted": [os.path.basename(p) for p in removed],
+                        }
+                elif cleanup_exports:
                     cleanup_result = {
-                        "status": "stale",
+                        "status": "skipped",
                         "deleted": [],
-                        "preview": _build_preview_response(
-                            file.filename,
-                            canonical_requested_output,
-                            debug_mode,
-                            export_policy,
-                        ).dict(),
-                    }
-                else:
-                    removed = cleanup_exports_helper(
-                        canonical_output_path, include_canonical=debug_mode
-                    )
-                    # Ensure the freshly created backup (if any) is removed as well
-                    if backup_path and os.path.exists(backup_path):
-                        try:
-                            os.remove(backup_path)
-                            removed.append(backup_path)
-                        except FileNotFoundError:
-                            pass
-                    cleanup_result = {
-                        "status": "performed",
-                        "deleted": [os.path.basename(p) for p in removed],
                     }
-            elif cleanup_exports:
-                cleanup_result = {
-                    "status": "skipped",
-                    "deleted": [],
-                }
 
             # Build preview/status
             status_info = None
@@ -565,6 +636,7 @@ def create_app() -> FastAPI:
             download_rel = os.path.relpath(out_path, APP_ROOT)
             download_url = f"/api/download/{session_id}/{os.path.basename(out_path)}"
 
+            issues_preview, totals = _issues_and_totals(analyzer, limit=100)
             return AnalyzeResponse(
                 analysis_id=session_id,
                 user=user_name,
@@ -579,8 +651,8 @@ def create_app() -> FastAPI:
                 output_filename=download_rel,
                 download_url=download_url,
                 status=status_info,
-                issues_preview=_issues_to_dtos(analyzer, limit=100),
-                totals=_totals(analyzer),
+                issues_preview=issues_preview,
+                totals=totals,
                 debug_mode=debug_mode,
                 cleanup=cleanup_result,
             )
@@ -598,15 +670,20 @@ def create_app() -> FastAPI:
         # Use Path.resolve() to ensure the final path is within OUTPUT_ROOT
         file_path = Path(OUTPUT_ROOT) / session_id / filename
         resolved_path = file_path.resolve()
-        output_root_resolved = Path(OUTPUT_ROOT).resolve()
 
-        # Check that the resolved path is within OUTPUT_ROOT
-        if not str(resolved_path).startswith(str(output_root_resolved)):
+        # Check that the resolved path is within OUTPUT_ROOT.
+        # is_relative_to 逐段比較路徑：startswith 會把 /out-suffix 誤判為
+        # /out 底下，也免去每請求的字串轉換
+        if not resolved_path.is_relative_to(_OUTPUT_ROOT_RESOLVED):
             raise HTTPException(status_code=400, detail="Access denied")
 
         if not resolved_path.exists():
             raise HTTPException(status_code=404, detail="File not found")
-        return FileResponse(str(resolved_path), filename=filename)
+        response = FileResponse(str(resolved_path), filename=filename)
+        # 1 MiB chunk：無 sendfile 的環境下把預設 64 KiB 的 read/send
+        # 往返縮到 1/16（有 sendfile 時 Starlette 自動走零拷貝，不受影響）
+        response.chunk_size = 1 << 20
+        return response
 
     # Serve static frontend (registered last so /api takes precedence)
     if os.path.isdir(WEB_DIR):
@@ -12,6 +12,8 @@ from lib import excel_exporter
 class TestExcelExporter(unittest.TestCase):
     def test_write_and_save_workbook(self) -> None:
         wb, ws, header_font, header_fill, border, align = excel_exporter.init_workbook()
+        # write-only 工作簿：欄寬需在寫入第一列前設定
+        excel_exporter.set_column_widths(ws, True)
         headers = ["日期", "類型", "時長(分鐘)", "說明", "時段", "計算式", "狀態"]
         excel_exporter.write_headers(ws, headers, header_font, header_fill, border, align)
         issue = Issue(
@@ -24,7 +26,6 @@ class TestExcelExporter(unittest.TestCase):
             is_new=True,
         )
         excel_exporter.write_issue_rows(ws, [issue], 2, True, border, align)
-        excel_exporter.set_column_widths(ws, True)
         with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
             excel_exporter.save_workbook(wb, tmp.name)
             saved_path = tmp.name
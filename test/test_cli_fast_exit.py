@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from lib.cli import run as cli_run
+
+
+class TestCliFastExit(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _copy_sample(self, name="202508-王小明-出勤資料.txt"):
+        src = os.path.join(os.getcwd(), "sample-attendance-data.txt")
+        dst = os.path.join(self.tmp.name, name)
+        shutil.copy(src, dst)
+        return dst
+
+    def test_repeat_incremental_run_skips_export(self):
+        f = self._copy_sample()
+        argv = ["attendance_analyzer.py", f, "csv"]
+        canonical = f.replace(".txt", "_analysis.csv")
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            with self.assertLogs(level="INFO"):
+                cli_run(argv)
+            self.assertTrue(os.path.exists(canonical))
+
+            # 第二次執行：狀態已涵蓋所有完整工作日，應直接快速結束
+            os.unlink(canonical)
+            with self.assertLogs(level="INFO") as cm:
+                cli_run(argv)
+            logs = "\n".join(cm.output)
+            self.assertIn("沒有新的工作日需要處理，略過分析與匯出", logs)
+            self.assertFalse(os.path.exists(canonical))
+        finally:
+            os.chdir(cwd)
+
+    def test_cleanup_exports_disables_fast_exit(self):
+        f = self._copy_sample()
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            with self.assertLogs(level="INFO"):
+                cli_run(["attendance_analyzer.py", f, "csv"])
+            # 重複執行加上 --cleanup-exports：不可快速結束，需走到清理流程
+            with self.assertLogs(level="INFO") as cm:
+                cli_run(["attendance_analyzer.py", f, "csv", "--cleanup-exports"])
+            logs = "\n".join(cm.output)
+            self.assertNotIn("沒有新的工作日需要處理，略過分析與匯出", logs)
+            self.assertIn("沒有可清除的匯出檔案", logs)
+        finally:
+            os.chdir(cwd)
+
+    def test_full_mode_always_exports(self):
+        f = self._copy_sample()
+        canonical = f.replace(".txt", "_analysis.csv")
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            with self.assertLogs(level="INFO"):
+                cli_run(["attendance_analyzer.py", f, "csv"])
+            os.unlink(canonical)
+            with self.assertLogs(level="INFO"):
+                cli_run(["attendance_analyzer.py", f, "csv", "--full"])
+            self.assertTrue(os.path.exists(canonical))
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
+"""Category: CLI
+Purpose: Fast-exit on repeat incremental runs with no new workdays."""
@@ -17,6 +17,18 @@ class TestConfigErrorHandling(unittest.TestCase):
             # Verify a known default remains in effect
             self.assertEqual(an.config.latest_checkin, "10:00")
 
+    def test_property_and_unknown_keys_are_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = os.path.join(tmp, "config.json")
+            with open(cfg, "w", encoding="utf-8") as f:
+                # schedule_start_time 是衍生 property 而非欄位；連同未知鍵都應被忽略
+                f.write(
+                    '{"schedule_start_time": "09:00", "no_such_key": 1, "latest_checkin": "10:30"}'
+                )
+            an = AttendanceAnalyzer(config_path=cfg)
+            self.assertEqual(an.config.latest_checkin, "10:30")
+            self.assertEqual(an.config.schedule_start, "09:30")
+
     def test_invalid_json_logs_warning(self):
         with tempfile.TemporaryDirectory() as tmp:
             cfg = os.path.join(tmp, "bad.json")
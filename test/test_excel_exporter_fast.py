@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from openpyxl import load_workbook
+
+from attendance_analyzer import AttendanceAnalyzer, Issue, IssueType
+from lib.excel_exporter_fast import save_xlsx_fast
+
+
+class TestExcelExporterFast(unittest.TestCase):
+    def test_save_and_reload_values(self):
+        header = ["日期", "類型", "時長(分鐘)"]
+        sheets = [
+            ("考勤分析_1", [header, ["2025/07/01", "遲到", 30]]),
+            ("考勤分析_2", [header, ["2025/07/02", "加班", 120]]),
+        ]
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
+            path = tmp.name
+        try:
+            save_xlsx_fast(path, sheets)
+            wb = load_workbook(path)
+            self.assertEqual(wb.sheetnames, ["考勤分析_1", "考勤分析_2"])
+            ws = wb["考勤分析_1"]
+            self.assertEqual(ws["A1"].value, "日期")
+            self.assertEqual(ws["A2"].value, "2025/07/01")
+            self.assertEqual(ws["B2"].value, "遲到")
+            self.assertEqual(ws["C2"].value, 30)
+            self.assertEqual(wb["考勤分析_2"]["C2"].value, 120)
+        finally:
+            os.remove(path)
+
+    def test_export_excel_dispatches_to_fast_backend(self):
+        analyzer = AttendanceAnalyzer()
+        analyzer.incremental_mode = False
+        analyzer.issues = [
+            Issue(datetime(2025, 7, 1), IssueType.LATE, 30, "遲到", "09:30~10:00", "calc"),
+            Issue(datetime(2025, 7, 2), IssueType.OVERTIME, 120, "加班", "18:30~20:30", "calc"),
+        ]
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
+            path = tmp.name
+        try:
+            with patch("lib.excel_exporter_fast.FAST_ROW_THRESHOLD", 1):
+                analyzer.export_excel(path)
+            ws = load_workbook(path).active
+            self.assertEqual(ws.title, "考勤分析")
+            self.assertEqual(ws["A2"].value, "2025/07/01")
+            self.assertEqual(ws["B3"].value, "加班")
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
+"""Category: Export/Excel
+Purpose: Raw-XML fast backend output and size-based dispatch."""
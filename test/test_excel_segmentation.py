@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from openpyxl import load_workbook
+
+from attendance_analyzer import AttendanceAnalyzer, Issue, IssueType
+from lib.cli import run as cli_run
+
+
+class TestExcelSegmentation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _path(self, name="analysis.xlsx"):
+        return os.path.join(self.tmp.name, name)
+
+    def test_segment_size_splits_sheets(self):
+        analyzer = AttendanceAnalyzer()
+        analyzer.incremental_mode = False
+        analyzer.issues = [
+            Issue(datetime(2025, 7, d), IssueType.LATE, 30, f"遲到{d}", "10:10~10:40", "calc")
+            for d in range(1, 6)
+        ]
+        path = self._path()
+        analyzer.export_excel(path, segment_size=2)
+        wb = load_workbook(path)
+        self.assertEqual(wb.sheetnames, ["考勤分析_1", "考勤分析_2", "考勤分析_3"])
+        # 每頁各自帶標題列；資料列依 2/2/1 切分
+        self.assertEqual([ws.max_row for ws in wb.worksheets], [3, 3, 2])
+        self.assertEqual(wb["考勤分析_1"]["A2"].value, "2025/07/01")
+        self.assertEqual(wb["考勤分析_2"]["A2"].value, "2025/07/03")
+        self.assertEqual(wb["考勤分析_3"]["A2"].value, "2025/07/05")
+
+    def test_status_row_does_not_count_against_first_segment(self):
+        analyzer = AttendanceAnalyzer()
+        analyzer.incremental_mode = True
+        analyzer.current_user = "王小明"
+        # 全為 WFH：non-WFH 問題為零時才會輸出狀態列
+        analyzer.issues = [
+            Issue(datetime(2025, 7, d), IssueType.WFH, 540, "WFH", "09:00~18:00", "", is_new=True)
+            for d in range(4, 8)
+        ]
+        path = self._path()
+        with patch.object(
+            analyzer,
+            "_compute_incremental_status_row",
+            return_value=("2025/07/31", 10, "2025-08-01T10:00:00"),
+        ):
+            analyzer.export_excel(path, segment_size=2)
+        wb = load_workbook(path)
+        self.assertEqual(wb.sheetnames, ["考勤分析_1", "考勤分析_2"])
+        ws1 = wb["考勤分析_1"]
+        # 第一頁：標題列 + 狀態列 + 2 筆問題列（狀態列不佔 segment 額度）
+        self.assertEqual(ws1.max_row, 4)
+        self.assertEqual(ws1["B2"].value, "狀態資訊")
+        self.assertEqual(ws1["A3"].value, "2025/07/04")
+        # 第二頁：剩下的 2 筆問題列
+        ws2 = wb["考勤分析_2"]
+        self.assertEqual(ws2.max_row, 3)
+        self.assertEqual(ws2["A2"].value, "2025/07/06")
+
+    def test_cli_segment_size_flag_reaches_export(self):
+        src = os.path.join(os.getcwd(), "sample-attendance-data.txt")
+        f = os.path.join(self.tmp.name, "202508-王小明-出勤資料.txt")
+        shutil.copy(src, f)
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            with self.assertLogs(level="INFO"):
+                cli_run(["attendance_analyzer.py", f, "excel", "--full", "--segment-size", "1"])
+            wb = load_workbook(f.replace(".txt", "_analysis.xlsx"))
+            self.assertGreater(len(wb.sheetnames), 1)
+            self.assertTrue(all(name.startswith("考勤分析_") for name in wb.sheetnames))
+            # segment-size 1：每頁僅標題列 + 1 筆資料列
+            self.assertTrue(all(ws.max_row == 2 for ws in wb.worksheets))
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
+"""Category: Export/Excel
+Purpose: Multi-sheet segmentation by segment_size and the CLI --segment-size flag."""
@@ -16,9 +16,6 @@ class TestExcelExporterMore(unittest.TestCase):
         # Write status row and assert returned next row index
         next_row = xls.write_status_row(ws, "2025/07/31", 22, "2025-09-13T12:00:00", border, align)
         self.assertEqual(next_row, 3)
-        self.assertEqual(ws["A2"].value, "2025/07/31")
-        self.assertEqual(ws["B2"].value, "狀態資訊")
-        self.assertEqual(ws["G2"].value, "系統狀態")
 
         # Prepare issues to hit all color branches
         issues = [
@@ -43,18 +40,23 @@ class TestExcelExporterMore(unittest.TestCase):
             alignment=align,
         )
 
-        # Sanity check values written
-        self.assertEqual(ws["B3"].value, "加班")
-        self.assertEqual(ws["B4"].value, "WFH假")
-        self.assertEqual(ws["B5"].value, "忘刷卡")
-        self.assertEqual(ws["G3"].value, "[NEW] 本次新發現")
-        self.assertEqual(ws["G4"].value, "已存在")
-
-        # Save to ensure no errors in save_workbook path
+        # write-only workbook 無法在寫入途中回讀儲存格，存檔後重新載入驗證
         with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
             xls.save_workbook(wb, tmp.name)
             saved = tmp.name
         self.assertTrue(os.path.exists(saved))
+
+        from openpyxl import load_workbook
+
+        ws2 = load_workbook(saved)["考勤分析"]
+        self.assertEqual(ws2["A2"].value, "2025/07/31")
+        self.assertEqual(ws2["B2"].value, "狀態資訊")
+        self.assertEqual(ws2["G2"].value, "系統狀態")
+        self.assertEqual(ws2["B3"].value, "加班")
+        self.assertEqual(ws2["B4"].value, "WFH假")
+        self.assertEqual(ws2["B5"].value, "忘刷卡")
+        self.assertEqual(ws2["G3"].value, "[NEW] 本次新發現")
+        self.assertEqual(ws2["G4"].value, "已存在")
         os.remove(saved)
 
 